@@ -4,22 +4,41 @@ Handles video processing, authentication, and notifications
 """
 import os
 import sys
-import json
 import asyncio
 import logging
 import time
-from datetime import datetime
+import queue
+import hashlib
+import threading
+from concurrent.futures import wait as wait_futures
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List
-from fastapi import FastAPI, File, UploadFile, Form, Depends, HTTPException, status
+from urllib.parse import quote
+from uuid import uuid4
+from typing import Any, Optional, List, Literal, Union
+from fastapi import FastAPI, File, UploadFile, Form, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
+from fastapi.responses import ORJSONResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, Json, field_validator
 import torch
 import yaml
-from sqlalchemy.orm import Session
+import httpx
+from sqlalchemy import select, insert, exists, func, case
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached
+from sqlalchemy.ext.asyncio import AsyncSession
 import jwt
-from passlib.context import CryptContext
+from cachetools import TTLCache
+
+try:
+    from celery import Celery
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,20 +47,72 @@ logger = logging.getLogger(__name__)
 # Add parent directory to path to import from models
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.action_detector import create_model
 from inference import UnsafeActionDetector
 from backend.database import (
-    get_db, User, VideoProcessing, AlertConfig, 
+    get_db, get_async_db, User, VideoProcessing, AlertConfig, 
     Jurisdiction, Industry, Project, JurisdictionRegulation, 
     ActionSeverity, ProjectActionSeverity, Stream as StreamModel
 )
 from backend.notifications import send_email_alert, send_sms_alert
-from backend.stream_manager import StreamManager, StreamConfig, validate_stream_url
+from backend.stream_manager import StreamManager, StreamConfig, validate_stream_url, MJPEG_BOUNDARY
 from backend.model_registry import get_model_registry
 from backend.hls_manager import get_hls_manager
+from backend.video_decoder import open_video_reader, frame_difference
+from backend.batcher import ClipBatcher
 
 # Initialize FastAPI app
-app = FastAPI(title="Workplace Safety Monitoring API", version="1.0.0")
+app = FastAPI(
+    title="Workplace Safety Monitoring API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject video uploads over MAX_UPLOAD_SIZE_MB while the body is still arriving
+
+    FastAPI parses (and spools to disk) the whole multipart form before the endpoint runs, so the
+    limit is enforced here: on Content-Length up front, and on the bytes received for chunked bodies
+    """
+
+    def __init__(self, app, path: str):
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+        
+        max_bytes = MAX_UPLOAD_SIZE_MB * 1024 * 1024
+        too_large = HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Video exceeds the {MAX_UPLOAD_SIZE_MB} MB upload limit"
+        )
+        
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            response = ORJSONResponse({"detail": too_large.detail}, status_code=too_large.status_code)
+            await response(scope, receive, send)
+            return
+        
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise too_large  # Surfaces from the form parser as a 413
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+
+# Innermost, so 413 responses still get CORS headers
+app.add_middleware(UploadSizeLimitMiddleware, path="/videos/upload")
 
 # CORS configuration - allow React frontend
 app.add_middleware(
@@ -54,28 +125,125 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Compress API payloads (project and video listings run to several KB of JSON);
+# media responses opt out with NO_COMPRESSION_HEADERS
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Security
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # JWT Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
+SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")  # Encoded once instead of on every sign/verify
+ALGORITHMS = [ALGORITHM]
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
+# Auth caches - keep TTLs short so revoked tokens/deleted users expire quickly
+_token_cache = TTLCache(maxsize=10000, ttl=30)  # sha256(token) -> decoded payload (never past its exp)
+_rejected_tokens = TTLCache(maxsize=10000, ttl=30)  # sha256(token) of tokens that failed verification
+_user_cache = TTLCache(maxsize=5000, ttl=60)  # user id -> detached User snapshot
+_oauth_cache = TTLCache(maxsize=5000, ttl=60)  # (provider, sha256(token)) -> verified OAuth user info
+_oauth_inflight = {}  # (provider, sha256(token)) -> in-progress provider verification
+
+# Project id -> (model path, project context) for get_detector_for_project; invalidated on project edits
+_project_detector_cache = TTLCache(maxsize=1024, ttl=300)
+
+# Jurisdiction/industry/regulation reference data is seeded by setup_database.py and rarely changes
+_reference_cache = TTLCache(maxsize=256, ttl=300)  # endpoint key -> serialized response payload
+
 # Load model configuration
 with open("config.yaml", "r") as f:
     config = yaml.safe_load(f)
 
+# Optional cap on intra-op CPU threads per torch call. Decode threads, video jobs and the stream
+# inference thread run torch work side by side and can oversubscribe the CPU; left at torch's
+# default (one per core) unless set, since CPU-only hosts need every core for inference
+if os.getenv("TORCH_NUM_THREADS"):
+    torch.set_num_threads(int(os.getenv("TORCH_NUM_THREADS")))
+
 # Initialize detector (singleton)
 detector = None
 stream_manager = None
+# Guard the singletons so concurrent first callers (startup, video jobs) never load the model twice
+_detector_lock = threading.Lock()
+_stream_manager_lock = threading.Lock()
+
+# Shared HTTP client for OAuth verification (keeps TLS connections to providers alive)
+_httpx_client: Optional[httpx.AsyncClient] = None
+
+# Largest accepted video upload
+MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "2048"))
+
+# Chunk size for streaming video files to and from disk
+FILE_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Default page size for videos listed inline on the project details page
+PROJECT_RECENT_VIDEOS = 50
+
+# Largest page a listing endpoint returns
+MAX_PAGE_SIZE = 200
+
+# Cap concurrent video jobs so simultaneous uploads queue up instead of contending for the GPU
+_video_semaphore = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_VIDEOS", "2")))
+
+# In-process video jobs; the event loop only keeps weak references to its tasks
+_video_tasks = set()
+
+# Set on server shutdown so in-process video jobs stop instead of holding up the exit
+# (they stay "processing" and are resumed on the next startup)
+_shutting_down = threading.Event()
+
+# Forward passes in flight at once across models; other jobs keep decoding their next batch meanwhile
+_gpu_semaphore = threading.BoundedSemaphore(int(os.getenv("GPU_CONCURRENCY", "1")))
+
+# Clips that video jobs and live streams submit within DETECTOR_MAX_WAIT_MS of each other share
+# one forward pass (up to DETECTOR_MAX_BATCH clips)
+DETECTOR_MAX_BATCH = int(os.getenv("DETECTOR_MAX_BATCH", "32"))
+DETECTOR_MAX_WAIT_MS = float(os.getenv("DETECTOR_MAX_WAIT_MS", "10"))
+
+
+def _new_clip_batcher() -> ClipBatcher:
+    """Batcher for one loaded model; its forward passes take a _gpu_semaphore slot"""
+    return ClipBatcher(DETECTOR_MAX_BATCH, DETECTOR_MAX_WAIT_MS, gate=_gpu_semaphore)
+
+# Email/SMS alerts raised while processing videos, and live stream alert handlers, run on one
+# long-lived event loop, so network I/O overlaps inference without setting up and tearing down
+# a loop per alert
+_notify_loop = asyncio.new_event_loop()
+threading.Thread(target=_notify_loop.run_forever, name="video-alerts", daemon=True).start()
+
+# Optional Celery queue for video jobs (Redis broker); without it jobs run in-process
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
+celery_app = None
+if CELERY_AVAILABLE and CELERY_BROKER_URL:
+    # Job status lives in video_processing, so a result backend is only set up when asked for
+    celery_app = Celery(
+        "safety",
+        broker=CELERY_BROKER_URL,
+        backend=os.getenv("CELERY_RESULT_BACKEND")
+    )
+    # One video at a time per GPU worker, requeued if the worker dies mid-video
+    celery_app.conf.worker_prefetch_multiplier = 1
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup"""
     from backend.database import SessionLocal
     
+    _shutting_down.clear()
+    
+    get_httpx_client()
+    
+    # Load and warm the default model now so the first request doesn't pay for it
+    try:
+        warm_detector = await asyncio.to_thread(get_detector)
+        await asyncio.to_thread(warm_detector.warmup)
+        get_stream_manager()
+        logger.info("Detector loaded and warmed up")
+    except FileNotFoundError as e:
+        logger.warning(f"Detector not loaded at startup: {e}")
+    
     # Mark previously active streams as stopped (don't auto-restart to avoid connection issues)
     db = SessionLocal()
     try:
@@ -97,65 +265,169 @@ async def startup_event():
         logger.error(f"Error reloading streams on startup: {e}")
     finally:
         db.close()
+    
+    # In-process jobs die with the server - optionally pick up videos a restart interrupted
+    # (a Celery broker keeps its own queue, so only needed without one). Opt-in: every worker
+    # runs this hook, and a video that crashed the process would be retried on every restart
+    if celery_app is None and os.getenv("RESUME_INTERRUPTED_VIDEOS", "0") == "1":
+        db = SessionLocal()
+        try:
+            interrupted = db.query(VideoProcessing).filter(
+                VideoProcessing.status.in_(("uploaded", "processing"))
+            ).all()
+            for video in interrupted:
+                logger.info(f"[Video {video.id}] Resuming processing interrupted by restart")
+                _start_video_task(video.id, video.filepath, video.user_id, video.project_id)
+        except Exception as e:
+            logger.error(f"Error resuming interrupted videos on startup: {e}")
+        finally:
+            db.close()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on application shutdown"""
+    _shutting_down.set()
+    
     logger.info("Shutting down - cleaning up HLS streams")
     hls_manager = get_hls_manager()
     hls_manager.cleanup_all()
+    
+    if _httpx_client is not None:
+        await _httpx_client.aclose()
+
+def get_httpx_client() -> httpx.AsyncClient:
+    """Shared pooled HTTP/2 client for outbound calls (created at startup, or on first use outside the app)"""
+    global _httpx_client
+    if _httpx_client is None or _httpx_client.is_closed:
+        _httpx_client = httpx.AsyncClient(
+            http2=True,
+            timeout=5.0,
+            # httpx drops idle connections after 5s by default, too short to span sporadic logins
+            limits=httpx.Limits(max_keepalive_connections=50, keepalive_expiry=60.0)
+        )
+    return _httpx_client
+
+
+def _default_model_path() -> str:
+    """Checkpoint the default detector loads"""
+    # Use the safety model trained with Label Studio annotations
+    model_path = "checkpoints/safety_model_best.pth"
+    
+    # Without a GPU, prefer the INT8 model produced by quantize_model.py if configured
+    quantized_path = config['inference'].get('quantized_model')
+    if quantized_path and not torch.cuda.is_available() and os.path.exists(quantized_path):
+        return quantized_path
+    if not os.path.exists(model_path):
+        # Fall back to generic model if safety model not available
+        model_path = "checkpoints/best_model.pth"
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"No model checkpoint found. Train a model first.")
+    return model_path
+
 
 def get_detector():
     global detector
-    if detector is None:
-        # Use the safety model trained with Label Studio annotations
-        model_path = "checkpoints/safety_model_best.pth"
-        if not os.path.exists(model_path):
-            # Fall back to generic model if safety model not available
-            model_path = "checkpoints/best_model.pth"
-            if not os.path.exists(model_path):
-                raise FileNotFoundError(f"No model checkpoint found. Train a model first.")
+    if detector is not None:
+        return detector
+    
+    with _detector_lock:
+        if detector is not None:
+            return detector
+        
+        model_path = _default_model_path()
         detector = UnsafeActionDetector(config, model_path)
+        detector.optimize_for_inference()
+        detector.clip_batcher = _new_clip_batcher()
         logger.info(f"Loaded detector model from: {model_path}")
-    return detector
+        return detector
+
+
+@lru_cache(maxsize=int(os.getenv("MAX_CACHED_MODELS", "8")))
+def _load_project_detector(model_path: str) -> UnsafeActionDetector:
+    """Load a project-specific model once; least recently used models are evicted to bound VRAM"""
+    project_detector = UnsafeActionDetector(config, model_path)
+    project_detector.optimize_for_inference()
+    project_detector.clip_batcher = _new_clip_batcher()
+    logger.info(f"Loaded project detector model from: {model_path}")
+    return project_detector
+
+
+def _is_default_checkpoint(model_path: str) -> bool:
+    """Whether model_path is the file the default detector loads"""
+    try:
+        return os.path.samefile(model_path, _default_model_path())
+    except OSError:
+        # Missing project model or no default checkpoint
+        return False
+
+
+def invalidate_project_detector(project_id: int):
+    """Drop a project's cached model choice and context after the project changes"""
+    with _detector_lock:
+        _project_detector_cache.pop(project_id, None)
 
 
 def get_detector_for_project(db: Session, project_id: int):
     """Get a detector configured for a specific project's jurisdiction and industry"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    
-    if not project:
-        return get_detector()
-    
-    # Get model registry
-    registry = get_model_registry()
-    
-    # Get appropriate model path
-    model_path, model_type = registry.get_model_path(
-        jurisdiction_code=project.jurisdiction.code,
-        industry_code=project.industry.code,
-        custom_path=project.model_path
-    )
+    with _detector_lock:
+        cached = _project_detector_cache.get(project_id)
+    
+    if cached is None:
+        project = db.execute(
+            select(Project)
+            .options(joinedload(Project.jurisdiction), joinedload(Project.industry))
+            .where(Project.id == project_id)
+        ).scalar_one_or_none()
+        
+        if not project:
+            return get_detector().fork()
+        
+        # Get model registry
+        registry = get_model_registry()
+        
+        # Get appropriate model path
+        model_path, model_type = registry.get_model_path(
+            jurisdiction_code=project.jurisdiction.code,
+            industry_code=project.industry.code,
+            custom_path=project.model_path
+        )
+        
+        # Store project context for filtering
+        project_context = {
+            "project_id": project.id,
+            "jurisdiction_id": project.jurisdiction_id,
+            "industry_id": project.industry_id,
+            "min_severity_alert": project.min_severity_alert
+        }
+        cached = (model_path, project_context)
+        with _detector_lock:
+            _project_detector_cache[project_id] = cached
     
-    # Create detector with project-specific model
-    detector = UnsafeActionDetector(config, model_path)
+    model_path, project_context = cached
     
-    # Store project context for filtering
-    detector.project_context = {
-        "project_id": project.id,
-        "jurisdiction_id": project.jurisdiction_id,
-        "industry_id": project.industry_id,
-        "min_severity_alert": project.min_severity_alert
-    }
+    # Share the loaded model across videos; the fork carries this job's buffers and project context.
+    # Projects on the default checkpoint use the default detector, so they batch with live streams
+    if _is_default_checkpoint(model_path):
+        detector = get_detector().fork()
+    else:
+        with _detector_lock:
+            detector = _load_project_detector(model_path).fork()
+    detector.project_context = dict(project_context)
     
     return detector
 
 def get_stream_manager():
     global stream_manager
-    if stream_manager is None:
+    if stream_manager is not None:
+        return stream_manager
+    
+    with _stream_manager_lock:
+        if stream_manager is not None:
+            return stream_manager
+        
         detector = get_detector()
-        stream_manager = StreamManager(detector)
+        stream_manager = StreamManager(detector, alert_loop=_notify_loop)
         
         # Add alert handler for database logging
         async def alert_handler(stream_id: str, action: str, confidence: float):
@@ -163,7 +435,7 @@ def get_stream_manager():
             # Additional handling can be added here
         
         stream_manager.add_alert_handler(alert_handler)
-    return stream_manager
+        return stream_manager
 
 
 # ===== Pydantic Models =====
@@ -187,7 +459,8 @@ class AlertConfigUpdate(BaseModel):
     enable_email: bool = True
     enable_sms: bool = False
     
-    @validator('phone')
+    @field_validator('phone')
+    @classmethod
     def validate_phone(cls, v):
         if v and not v.startswith('+'):
             raise ValueError('Phone number must start with + and country code')
@@ -195,6 +468,8 @@ class AlertConfigUpdate(BaseModel):
 
 
 class VideoUploadResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     video_id: str
     filename: str
     status: str
@@ -202,6 +477,8 @@ class VideoUploadResponse(BaseModel):
 
 
 class AlertNotification(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     timestamp: str
     action: str
     confidence: float
@@ -213,22 +490,9 @@ class StreamCreate(BaseModel):
     name: str
     source_url: str
     browser_preview_url: Optional[str] = None
-    source_type: str  # 'rtsp', 'rtmp', 'http', 'webcam'
+    source_type: Literal['rtsp', 'rtmp', 'http', 'webcam']
     project_id: int
-    fps: int = 30
-    
-    @validator('source_type')
-    def validate_source_type(cls, v):
-        allowed_types = ['rtsp', 'rtmp', 'http', 'webcam']
-        if v not in allowed_types:
-            raise ValueError(f'source_type must be one of {allowed_types}')
-        return v
-    
-    @validator('fps')
-    def validate_fps(cls, v):
-        if v < 1 or v > 60:
-            raise ValueError('fps must be between 1 and 60')
-        return v
+    fps: int = Field(30, ge=1, le=60)
 
 
 class StreamUpdate(BaseModel):
@@ -243,135 +507,177 @@ class ProjectCreate(BaseModel):
     jurisdiction_id: int
     industry_id: int
     model_path: Optional[str] = None
-    confidence_threshold_override: Optional[str] = None  # JSON string
-    min_severity_alert: int = 1
-    
-    @validator('min_severity_alert')
-    def validate_min_severity(cls, v):
-        if v < 1 or v > 5:
-            raise ValueError('min_severity_alert must be between 1 and 5')
-        return v
+    confidence_threshold_override: Optional[Json[Any]] = None  # JSON string, parsed once on the way in
+    min_severity_alert: int = Field(1, ge=1, le=5)
 
 
 class ProjectUpdate(BaseModel):
     name: Optional[str] = None
     model_path: Optional[str] = None
-    confidence_threshold_override: Optional[str] = None
-    min_severity_alert: Optional[int] = None
-    
-    @validator('min_severity_alert')
-    def validate_min_severity(cls, v):
-        if v is not None and (v < 1 or v > 5):
-            raise ValueError('min_severity_alert must be between 1 and 5')
-        return v
+    confidence_threshold_override: Optional[Json[Any]] = None
+    min_severity_alert: Optional[int] = Field(None, ge=1, le=5)
 
 
 class ActionSeverityUpdate(BaseModel):
     action_name: str
-    custom_severity_level: int
-    
-    @validator('custom_severity_level')
-    def validate_severity(cls, v):
-        if v < 1 or v > 5:
-            raise ValueError('custom_severity_level must be between 1 and 5')
-        return v
+    custom_severity_level: int = Field(..., ge=1, le=5)
 
 
 # ===== Authentication =====
 
-def create_access_token(data: dict) -> str:
-    """Create JWT access token"""
-    import jwt
-    from datetime import datetime, timedelta
-    
+async def create_access_token(data: dict) -> str:
+    """Create JWT access token (signed in the threadpool to keep the event loop free)"""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = await run_in_threadpool(jwt.encode, to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token"""
+def _detached_user_copy(user: User) -> User:
+    """Copy a User's column values into a detached instance that can be shared across sessions"""
+    snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+async def _decode_token(token: str) -> dict:
+    """Verify a JWT and return its payload, reusing verifications still within their exp"""
+    token_key = hashlib.sha256(token.encode()).digest()
+    
+    payload = _token_cache.get(token_key)
+    if payload is not None and payload["exp"] > time.time():
+        return payload
+    
+    # Reconnecting <img>/<video> clients keep retrying expired tokens; reject those without re-verifying
+    if token_key in _rejected_tokens:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials"
+        )
+    
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
+        payload = await run_in_threadpool(
+            jwt.decode, token, SECRET_KEY_BYTES,
+            algorithms=ALGORITHMS,
+            options={"require": ["exp", "sub"]}
+        )
     except jwt.PyJWTError:
+        _token_cache.pop(token_key, None)
+        _rejected_tokens[token_key] = True
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
+    _token_cache[token_key] = payload
+    return payload
+
+
+async def _resolve_user(token: str, db: Union[Session, AsyncSession]) -> User:
+    """Return the User a token belongs to, serving repeat lookups from the auth caches"""
+    payload = await _decode_token(token)
+    user_id: str = payload["sub"]
+    is_async = isinstance(db, AsyncSession)
+    
+    # Cache hit: attach the snapshot to this session without issuing a SELECT
+    cached_user = _user_cache.get(user_id)
+    if cached_user is not None:
+        if is_async:
+            return await db.merge(cached_user, load=False)
+        return db.merge(cached_user, load=False)
+    
+    if is_async:
+        user = await db.get(User, int(user_id))
+    else:
+        user = db.get(User, int(user_id))
     
-    user = db.query(User).filter(User.id == user_id).first()
     if user is None:
+        _token_cache.pop(hashlib.sha256(token.encode()).digest(), None)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
+    _user_cache[user_id] = _detached_user_copy(user)
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Get current authenticated user from JWT token"""
+    return await _resolve_user(credentials.credentials, db)
+
+
 async def verify_oauth_token(provider: str, token: str) -> dict:
     """Verify OAuth token with provider and return user info"""
-    import httpx
+    cache_key = (provider, hashlib.sha256(token.encode()).digest())
+    cached_info = _oauth_cache.get(cache_key)
+    if cached_info is not None:
+        return cached_info
+    
+    # Concurrent logins with the same token (e.g. client retries) share one provider call
+    pending = _oauth_inflight.get(cache_key)
+    if pending is None:
+        pending = asyncio.ensure_future(_fetch_oauth_user_info(provider, token))
+        _oauth_inflight[cache_key] = pending
+        pending.add_done_callback(lambda _: _oauth_inflight.pop(cache_key, None))
     
+    verified_info = await asyncio.shield(pending)
+    _oauth_cache[cache_key] = verified_info
+    return verified_info
+
+
+async def _fetch_oauth_user_info(provider: str, token: str) -> dict:
+    """Ask the OAuth provider who a token belongs to"""
     if provider == "google":
         # Verify Google OAuth token
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://www.googleapis.com/oauth2/v3/userinfo",
-                headers={"Authorization": f"Bearer {token}"}
+        response = await get_httpx_client().get(
+            "https://www.googleapis.com/oauth2/v3/userinfo",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid Google OAuth token"
             )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid Google OAuth token"
-                )
-            user_info = response.json()
-            return {
-                "oauth_id": user_info["sub"],
-                "email": user_info["email"],
-                "name": user_info.get("name", ""),
-                "picture": user_info.get("picture", "")
-            }
+        user_info = response.json()
+        verified_info = {
+            "oauth_id": user_info["sub"],
+            "email": user_info["email"],
+            "name": user_info.get("name", ""),
+            "picture": user_info.get("picture", "")
+        }
     
     elif provider == "facebook":
         # Verify Facebook OAuth token
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://graph.facebook.com/me",
-                params={
-                    "fields": "id,name,email,picture",
-                    "access_token": token
-                }
-            )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid Facebook OAuth token"
-                )
-            user_info = response.json()
-            return {
-                "oauth_id": user_info["id"],
-                "email": user_info.get("email", ""),
-                "name": user_info.get("name", ""),
-                "picture": user_info.get("picture", {}).get("data", {}).get("url", "")
+        response = await get_httpx_client().get(
+            "https://graph.facebook.com/me",
+            params={
+                "fields": "id,name,email,picture",
+                "access_token": token
             }
+        )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid Facebook OAuth token"
+            )
+        user_info = response.json()
+        verified_info = {
+            "oauth_id": user_info["id"],
+            "email": user_info.get("email", ""),
+            "name": user_info.get("name", ""),
+            "picture": user_info.get("picture", {}).get("data", {}).get("url", "")
+        }
     
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unsupported OAuth provider: {provider}"
         )
+    
+    return verified_info
 
 
 # ===== API Endpoints =====
@@ -379,15 +685,17 @@ async def verify_oauth_token(provider: str, token: str) -> dict:
 @app.get("/")
 async def root():
     """Health check endpoint"""
-    return {
+    # Returned directly so load-balancer probes skip jsonable_encoder
+    return ORJSONResponse({
         "status": "online",
         "message": "Workplace Safety Monitoring API",
-        "version": "1.0.0"
-    }
+        "version": "1.0.0",
+        "model_loaded": detector is not None
+    })
 
 
 @app.post("/auth/login")
-async def login(login_data: UserLogin, db: Session = Depends(get_db)):
+async def login(login_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """
     Login or register user with OAuth token
     Verifies token with OAuth provider and creates/updates user
@@ -396,10 +704,11 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
     user_info = await verify_oauth_token(login_data.oauth_provider, login_data.oauth_token)
     
     # Check if user exists
-    user = db.query(User).filter(
+    result = await db.execute(select(User).where(
         User.oauth_provider == login_data.oauth_provider,
         User.oauth_id == user_info["oauth_id"]
-    ).first()
+    ))
+    user = result.scalar_one_or_none()
     
     if not user:
         # Create new user
@@ -411,17 +720,19 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
             picture=user_info.get("picture")
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
     else:
         # Update user info
         user.name = user_info["name"]
         user.picture = user_info.get("picture")
         user.last_login = datetime.utcnow()
-        db.commit()
+        await db.commit()
+        # Profile fields just changed, so don't serve the old snapshot to /auth/me
+        _user_cache.pop(str(user.id), None)
     
     # Create access token
-    access_token = create_access_token({"sub": str(user.id)})
+    access_token = await create_access_token({"sub": str(user.id)})
     
     return {
         "access_token": access_token,
@@ -438,24 +749,25 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
 @app.get("/auth/me")
 async def get_me(current_user: User = Depends(get_current_user)):
     """Get current user information"""
-    return {
+    return ORJSONResponse({
         "id": current_user.id,
         "email": current_user.email,
         "name": current_user.name,
         "picture": current_user.picture,
-        "created_at": current_user.created_at.isoformat()
-    }
+        "created_at": current_user.created_at
+    })
 
 
 @app.get("/config/alerts")
 async def get_alert_config(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's alert configuration"""
-    alert_config = db.query(AlertConfig).filter(
+    result = await db.execute(select(AlertConfig).where(
         AlertConfig.user_id == current_user.id
-    ).first()
+    ))
+    alert_config = result.scalar_one_or_none()
     
     if not alert_config:
         # Return default config
@@ -478,12 +790,13 @@ async def get_alert_config(
 async def update_alert_config(
     config: AlertConfigUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update user's alert configuration"""
-    alert_config = db.query(AlertConfig).filter(
+    result = await db.execute(select(AlertConfig).where(
         AlertConfig.user_id == current_user.id
-    ).first()
+    ))
+    alert_config = result.scalar_one_or_none()
     
     if not alert_config:
         # Create new config
@@ -504,8 +817,8 @@ async def update_alert_config(
         alert_config.enable_email = config.enable_email
         alert_config.enable_sms = config.enable_sms
     
-    db.commit()
-    db.refresh(alert_config)
+    await db.commit()
+    await db.refresh(alert_config)
     
     return {
         "message": "Alert configuration updated successfully",
@@ -518,6 +831,52 @@ async def update_alert_config(
     }
 
 
+# Test email, built once; only the address and send time are filled in per request
+_TEST_EMAIL_SUBJECT = "🧪 TEST ALERT - Workplace Safety Monitoring System"
+_TEST_EMAIL_TEMPLATE = """
+<html>
+<body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
+    <div style="background-color: #3b82f6; color: white; padding: 20px; border-radius: 8px 8px 0 0; text-align: center;">
+        <h1 style="margin: 0;">🧪 TEST ALERT</h1>
+        <p style="margin: 10px 0 0 0; font-size: 14px;">This is a test notification</p>
+    </div>
+    
+    <div style="background-color: #f3f4f6; padding: 20px; border-radius: 0 0 8px 8px;">
+        <div style="background-color: white; padding: 20px; border-radius: 8px; margin-bottom: 15px;">
+            <h2 style="color: #1f2937; margin-top: 0;">Your Email Alerts Are Working!</h2>
+            <p style="color: #4b5563; line-height: 1.6;">
+                This is a <strong>test message</strong> from your Workplace Safety Monitoring System. 
+                <strong>No action is required.</strong>
+            </p>
+            <p style="color: #4b5563; line-height: 1.6;">
+                If you receive this email, your alert configuration is working correctly and you will 
+                receive notifications when unsafe actions are detected in your video streams.
+            </p>
+        </div>
+        
+        <div style="background-color: #dbeafe; border-left: 4px solid #3b82f6; padding: 15px; border-radius: 4px;">
+            <p style="color: #1e40af; margin: 0; font-size: 14px;">
+                <strong>Test Email Details:</strong>
+            </p>
+            <ul style="color: #1e40af; margin: 10px 0 0 0; font-size: 14px;">
+                <li>Email Address: {email_to}</li>
+                <li>Sent At: {sent_at}</li>
+                <li>Configuration: Email alerts enabled</li>
+            </ul>
+        </div>
+        
+        <div style="margin-top: 20px; padding-top: 15px; border-top: 1px solid #d1d5db; text-align: center;">
+            <p style="color: #6b7280; font-size: 12px; margin: 0;">
+                Workplace Safety Monitoring System<br>
+                This is an automated test message. No response is required.
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
 @app.post("/config/alerts/test-email")
 async def send_test_email(
     current_user: User = Depends(get_current_user),
@@ -540,62 +899,33 @@ async def send_test_email(
         from backend.notifications import send_email_notification
         
         # Send test email with clear test message
-        subject = "🧪 TEST ALERT - Workplace Safety Monitoring System"
+        subject = _TEST_EMAIL_SUBJECT
         
-        body = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
-            <div style="background-color: #3b82f6; color: white; padding: 20px; border-radius: 8px 8px 0 0; text-align: center;">
-                <h1 style="margin: 0;">🧪 TEST ALERT</h1>
-                <p style="margin: 10px 0 0 0; font-size: 14px;">This is a test notification</p>
-            </div>
-            
-            <div style="background-color: #f3f4f6; padding: 20px; border-radius: 0 0 8px 8px;">
-                <div style="background-color: white; padding: 20px; border-radius: 8px; margin-bottom: 15px;">
-                    <h2 style="color: #1f2937; margin-top: 0;">Your Email Alerts Are Working!</h2>
-                    <p style="color: #4b5563; line-height: 1.6;">
-                        This is a <strong>test message</strong> from your Workplace Safety Monitoring System. 
-                        <strong>No action is required.</strong>
-                    </p>
-                    <p style="color: #4b5563; line-height: 1.6;">
-                        If you receive this email, your alert configuration is working correctly and you will 
-                        receive notifications when unsafe actions are detected in your video streams.
-                    </p>
-                </div>
-                
-                <div style="background-color: #dbeafe; border-left: 4px solid #3b82f6; padding: 15px; border-radius: 4px;">
-                    <p style="color: #1e40af; margin: 0; font-size: 14px;">
-                        <strong>Test Email Details:</strong>
-                    </p>
-                    <ul style="color: #1e40af; margin: 10px 0 0 0; font-size: 14px;">
-                        <li>Email Address: {email_to}</li>
-                        <li>Sent At: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}</li>
-                        <li>Configuration: Email alerts enabled</li>
-                    </ul>
-                </div>
-                
-                <div style="margin-top: 20px; padding-top: 15px; border-top: 1px solid #d1d5db; text-align: center;">
-                    <p style="color: #6b7280; font-size: 12px; margin: 0;">
-                        Workplace Safety Monitoring System<br>
-                        This is an automated test message. No response is required.
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        body = _TEST_EMAIL_TEMPLATE.format(
+            email_to=email_to,
+            sent_at=datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+        )
         
-        send_email_notification(
+        # SMTP runs in the threadpool so the event loop stays free; the result is reported back
+        sent = await run_in_threadpool(
+            send_email_notification,
             to_email=email_to,
             subject=subject,
             body=body
         )
+        if not sent:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Test email could not be sent - check the SMTP configuration"
+            )
         
         return {
             "message": "Test email sent successfully",
             "email": email_to
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -632,16 +962,25 @@ async def send_test_sms(
             "You will receive real alerts when unsafe actions are detected."
         )
         
-        send_sms_notification(
+        # Twilio call runs in the threadpool so the event loop stays free; the result is reported back
+        sent = await run_in_threadpool(
+            send_sms_notification,
             to_phone=alert_config.phone,
             message=message
         )
+        if not sent:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Test SMS could not be sent - check the Twilio configuration"
+            )
         
         return {
             "message": "Test SMS sent successfully",
             "phone": alert_config.phone
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -657,9 +996,13 @@ async def list_jurisdictions(
     db: Session = Depends(get_db)
 ):
     """List all available jurisdictions"""
+    payload = _reference_cache.get(("jurisdictions",))
+    if payload is not None:
+        return ORJSONResponse(payload)
+    
     jurisdictions = db.query(Jurisdiction).filter(Jurisdiction.is_active == True).all()
     
-    return {
+    payload = {
         "jurisdictions": [
             {
                 "id": j.id,
@@ -672,6 +1015,8 @@ async def list_jurisdictions(
             for j in jurisdictions
         ]
     }
+    _reference_cache[("jurisdictions",)] = payload
+    return ORJSONResponse(payload)
 
 
 @app.get("/industries")
@@ -680,20 +1025,26 @@ async def list_industries(
     db: Session = Depends(get_db)
 ):
     """List all available industries"""
+    payload = _reference_cache.get(("industries",))
+    if payload is not None:
+        return ORJSONResponse(payload)
+    
     industries = db.query(Industry).filter(Industry.is_active == True).all()
     
-    return {
+    payload = {
         "industries": [
             {
                 "id": i.id,
                 "name": i.name,
                 "code": i.code,
                 "description": i.description,
-                "hazard_categories": json.loads(i.hazard_categories) if i.hazard_categories else []
+                "hazard_categories": i.hazard_categories or []
             }
             for i in industries
         ]
     }
+    _reference_cache[("industries",)] = payload
+    return ORJSONResponse(payload)
 
 
 @app.get("/jurisdictions/{jurisdiction_id}/regulations")
@@ -704,6 +1055,11 @@ async def get_regulations(
     db: Session = Depends(get_db)
 ):
     """Get regulations for a specific jurisdiction and optionally industry"""
+    cache_key = ("regulations", jurisdiction_id, industry_id)
+    payload = _reference_cache.get(cache_key)
+    if payload is not None:
+        return ORJSONResponse(payload)
+    
     query = db.query(JurisdictionRegulation).filter(
         JurisdictionRegulation.jurisdiction_id == jurisdiction_id
     )
@@ -713,23 +1069,30 @@ async def get_regulations(
     
     regulations = query.all()
     
-    return {
+    payload = {
         "regulations": [
             {
                 "id": r.id,
                 "regulation_code": r.regulation_code,
                 "title": r.title,
                 "description": r.description,
-                "violation_mapping": json.loads(r.violation_mapping) if r.violation_mapping else {},
+                "violation_mapping": r.violation_mapping or {},
                 "industry_id": r.industry_id
             }
             for r in regulations
         ]
     }
+    _reference_cache[cache_key] = payload
+    return ORJSONResponse(payload)
 
 
 # ===== Project Management =====
 
+def _owns_project(db: Session, project_id: int, user_id: int) -> bool:
+    """Check project ownership with an EXISTS query instead of loading the Project row"""
+    return db.scalar(select(exists().where(Project.id == project_id, Project.user_id == user_id)))
+
+
 @app.post("/projects")
 async def create_project(
     project_data: ProjectCreate,
@@ -738,7 +1101,7 @@ async def create_project(
 ):
     """Create a new project"""
     # Validate jurisdiction exists
-    jurisdiction = db.query(Jurisdiction).filter(Jurisdiction.id == project_data.jurisdiction_id).first()
+    jurisdiction = db.get(Jurisdiction, project_data.jurisdiction_id)
     if not jurisdiction:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -746,7 +1109,7 @@ async def create_project(
         )
     
     # Validate industry exists
-    industry = db.query(Industry).filter(Industry.id == project_data.industry_id).first()
+    industry = db.get(Industry, project_data.industry_id)
     if not industry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -782,7 +1145,7 @@ async def create_project(
             "code": industry.code
         },
         "min_severity_alert": project.min_severity_alert,
-        "created_at": project.created_at.isoformat()
+        "created_at": project.created_at
     }
 
 
@@ -792,42 +1155,75 @@ async def list_projects(
     db: Session = Depends(get_db)
 ):
     """List user's projects"""
-    projects = db.query(Project).filter(Project.user_id == current_user.id).all()
+    # Counts are correlated subqueries so no video/stream rows are loaded just to take len()
+    video_count = select(func.count(VideoProcessing.id)).where(
+        VideoProcessing.project_id == Project.id
+    ).correlate(Project).scalar_subquery()
+    stream_count = select(func.count(StreamModel.id)).where(
+        StreamModel.project_id == Project.id
+    ).correlate(Project).scalar_subquery()
+    
+    # One query of plain column rows: no Project/Jurisdiction/Industry instances are built per project
+    rows = db.execute(
+        select(
+            Project.id,
+            Project.name,
+            Project.min_severity_alert,
+            Project.created_at,
+            Project.updated_at,
+            Jurisdiction.id.label("jurisdiction_id"),
+            Jurisdiction.name.label("jurisdiction_name"),
+            Jurisdiction.code.label("jurisdiction_code"),
+            Industry.id.label("industry_id"),
+            Industry.name.label("industry_name"),
+            Industry.code.label("industry_code"),
+            video_count.label("video_count"),
+            stream_count.label("stream_count")
+        )
+        .join(Jurisdiction, Project.jurisdiction_id == Jurisdiction.id)
+        .join(Industry, Project.industry_id == Industry.id)
+        .where(Project.user_id == current_user.id)
+    ).all()
     
-    return {
+    return ORJSONResponse({
         "projects": [
             {
                 "id": p.id,
                 "name": p.name,
                 "jurisdiction": {
-                    "id": p.jurisdiction.id,
-                    "name": p.jurisdiction.name,
-                    "code": p.jurisdiction.code
+                    "id": p.jurisdiction_id,
+                    "name": p.jurisdiction_name,
+                    "code": p.jurisdiction_code
                 },
                 "industry": {
-                    "id": p.industry.id,
-                    "name": p.industry.name,
-                    "code": p.industry.code
+                    "id": p.industry_id,
+                    "name": p.industry_name,
+                    "code": p.industry_code
                 },
                 "min_severity_alert": p.min_severity_alert,
-                "video_count": len(p.videos),
-                "stream_count": len(p.streams),
-                "created_at": p.created_at.isoformat(),
-                "updated_at": p.updated_at.isoformat()
+                "video_count": p.video_count,
+                "stream_count": p.stream_count,
+                "created_at": p.created_at,
+                "updated_at": p.updated_at
             }
-            for p in projects
+            for p in rows
         ]
-    }
+    })
 
 
 @app.get("/projects/{project_id}")
 async def get_project(
     project_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    limit: int = Query(PROJECT_RECENT_VIDEOS, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
 ):
     """Get project details"""
-    project = db.query(Project).filter(
+    project = db.query(Project).options(
+        joinedload(Project.jurisdiction),
+        joinedload(Project.industry)
+    ).filter(
         Project.id == project_id,
         Project.user_id == current_user.id
     ).first()
@@ -851,22 +1247,30 @@ async def get_project(
     
     custom_severity_map = {cs.action_name: cs.custom_severity_level for cs in custom_severities}
     
-    # Get videos associated with this project
-    videos = db.query(VideoProcessing).filter(
-        VideoProcessing.project_id == project_id
-    ).order_by(VideoProcessing.uploaded_at.desc()).all()
-    
-    # Get video statistics
-    total_videos = len(videos)
-    safe_videos = sum(1 for v in videos if v.status == "safe")
-    unsafe_videos = sum(1 for v in videos if v.status == "unsafe_detected")
-    processing_videos = sum(1 for v in videos if v.status in ["uploaded", "processing"])
-    
-    # Get stream count
-    active_streams = db.query(StreamModel).filter(
+    # Video and stream statistics in one aggregate query
+    active_streams = select(func.count()).where(
         StreamModel.project_id == project_id,
         StreamModel.status == "active"
-    ).count()
+    ).scalar_subquery()
+    stats = db.execute(select(
+        func.count().label("total_videos"),
+        func.coalesce(func.sum(case((VideoProcessing.status == "safe", 1), else_=0)), 0).label("safe_videos"),
+        func.coalesce(func.sum(case((VideoProcessing.status == "unsafe_detected", 1), else_=0)), 0).label("unsafe_videos"),
+        func.coalesce(func.sum(case((VideoProcessing.status.in_(["uploaded", "processing"]), 1), else_=0)), 0).label("processing_videos"),
+        active_streams.label("active_streams")
+    ).where(VideoProcessing.project_id == project_id)).one()
+    
+    # One page of the project's videos, newest first (an index range scan on ix_video_project_time);
+    # older pages come from limit/offset here or /videos?project_id=
+    videos = db.query(
+        VideoProcessing.id,
+        VideoProcessing.filename,
+        VideoProcessing.status,
+        VideoProcessing.uploaded_at,
+        VideoProcessing.processed_at
+    ).filter(
+        VideoProcessing.project_id == project_id
+    ).order_by(VideoProcessing.uploaded_at.desc()).limit(limit).offset(offset).all()
     
     return {
         "id": project.id,
@@ -883,7 +1287,7 @@ async def get_project(
             "code": project.industry.code
         },
         "model_path": project.model_path,
-        "confidence_threshold_override": json.loads(project.confidence_threshold_override) if project.confidence_threshold_override else None,
+        "confidence_threshold_override": project.confidence_threshold_override,
         "min_severity_alert": project.min_severity_alert,
         "action_severities": [
             {
@@ -897,24 +1301,25 @@ async def get_project(
             for asev in action_severities
         ],
         "stats": {
-            "total_videos": total_videos,
-            "safe_videos": safe_videos,
-            "unsafe_videos": unsafe_videos,
-            "processing_videos": processing_videos,
-            "active_streams": active_streams
+            "total_videos": stats.total_videos,
+            "safe_videos": stats.safe_videos,
+            "unsafe_videos": stats.unsafe_videos,
+            "processing_videos": stats.processing_videos,
+            "active_streams": stats.active_streams
         },
         "videos": [
             {
                 "video_id": v.id,
                 "filename": v.filename,
                 "status": v.status,
-                "uploaded_at": v.uploaded_at.isoformat(),
-                "processed_at": v.processed_at.isoformat() if v.processed_at else None
+                "uploaded_at": v.uploaded_at,
+                "processed_at": v.processed_at
             }
             for v in videos
         ],
-        "created_at": project.created_at.isoformat(),
-        "updated_at": project.updated_at.isoformat()
+        "has_more": offset + len(videos) < stats.total_videos,
+        "created_at": project.created_at,
+        "updated_at": project.updated_at
     }
 
 
@@ -949,6 +1354,7 @@ async def update_project(
     
     db.commit()
     db.refresh(project)
+    invalidate_project_detector(project_id)
     
     return {
         "message": "Project updated successfully",
@@ -989,6 +1395,7 @@ async def delete_project(
     
     db.delete(project)
     db.commit()
+    invalidate_project_detector(project_id)
     
     return {"message": "Project deleted successfully"}
 
@@ -1001,12 +1408,7 @@ async def update_action_severity(
     db: Session = Depends(get_db)
 ):
     """Update custom severity level for an action in a project"""
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.user_id == current_user.id
-    ).first()
-    
-    if not project:
+    if not _owns_project(db, project_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
@@ -1037,96 +1439,189 @@ async def update_action_severity(
     }
 
 
-async def process_video_task(
+def run_video_processing(
     video_id: str,
     video_path: str,
     user_id: str,
     project_id: Optional[int] = None,
 ):
-    """Process video in a worker thread so the event loop stays responsive."""
+    """Run detection over an uploaded video and store the result (blocking, runs off the event loop)"""
     from backend.database import SessionLocal
 
-    def _send_email(alert_config, action, confidence, filename):
+    async def _send_email(to_email, action, confidence, filename):
         try:
-            asyncio.run(send_email_alert(
-                alert_config.email,
+            await send_email_alert(
+                to_email,
                 action,
                 confidence,
                 filename
-            ))
+            )
         except Exception as notify_err:
             print(f"Failed to send email alert: {notify_err}")
 
-    def _send_sms(alert_config, action, confidence, filename):
+    async def _send_sms(to_phone, action, confidence, filename):
         try:
-            asyncio.run(send_sms_alert(
-                alert_config.phone,
+            await send_sms_alert(
+                to_phone,
                 action,
                 confidence,
                 filename
-            ))
+            )
         except Exception as notify_err:
             print(f"Failed to send SMS alert: {notify_err}")
 
-    def worker():
-        db = SessionLocal()
-        try:
-            video_record = db.query(VideoProcessing).filter(
-                VideoProcessing.id == video_id
-            ).first()
-            if not video_record:
-                logger.error(f"[Video {video_id}] Video record not found in database")
-                return
-
-            logger.info(f"[Video {video_id}] Starting processing: {video_record.filename}")
-            video_record.status = "processing"
-            db.commit()
+    async def _deliver_alerts(notifications):
+        await asyncio.gather(*notifications)
 
-            # Get detector with project-specific model if available
-            logger.info(f"[Video {video_id}] Loading AI model...")
-            detector = get_detector_for_project(db, project_id) if project_id else get_detector()
-            logger.info(f"[Video {video_id}] AI model loaded successfully")
+    # Nothing loaded for the job should be re-selected after the status commits
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        # Flag the job first; committing after the eager load below would expire what it fetched
+        updated = db.query(VideoProcessing).filter(
+            VideoProcessing.id == video_id
+        ).update({"status": "processing"}, synchronize_session=False)
+        db.commit()
+        if not updated:
+            logger.error(f"[Video {video_id}] Video record not found in database")
+            return
+
+        # Owner's alert settings come back in the same round-trip as the video
+        video_record = db.query(VideoProcessing).options(
+            joinedload(VideoProcessing.user).joinedload(User.alert_config)
+        ).filter(
+            VideoProcessing.id == video_id
+        ).first()
+        logger.info(f"[Video {video_id}] Starting processing: {video_record.filename}")
+
+        # Get detector with project-specific model if available
+        logger.info(f"[Video {video_id}] Loading AI model...")
+        detector = get_detector_for_project(db, project_id) if project_id else get_detector().fork()
+        logger.info(f"[Video {video_id}] AI model loaded successfully")
+
+        alert_config = video_record.user.alert_config
+
+        # Plain locals for everything the detection loop reads, so it never touches ORM attributes
+        filename = video_record.filename
+        alert_email = alert_config.email if alert_config and alert_config.enable_email else None
+        alert_phone = alert_config.phone if alert_config and alert_config.enable_sms else None
+
+        # Decodes on the GPU (NVDEC) when available so frames stay in device memory
+        stride = max(1, int(config['inference'].get('stride', 1)))
+        # With a motion threshold, frames between keyframes are decoded too and analysed when the scene changes
+        motion_threshold = config['inference'].get('motion_threshold')
+        cap = open_video_reader(video_path, stride=1 if motion_threshold is not None else stride)
+
+        # Get video properties for progress tracking
+        total_frames = cap.total_frames
+        fps = cap.fps
+        duration_sec = total_frames / fps if fps > 0 else 0
+        width = cap.width
+        height = cap.height
+        
+        logger.info(f"[Video {video_id}] Video info: {total_frames} frames, {fps:.1f} FPS, {duration_sec:.1f}s duration, {width}x{height}")
+
+        unsafe_actions_detected = []
+        frame_count = 0
+        last_progress_log = 0
+        progress_interval = max(1, total_frames // 10)  # Log every 10%
+        start_time = time.time()
+        started_at = datetime.fromtimestamp(start_time)
+        batch_size = config['inference'].get('batch_size', 16)
+        frame_batch = []
+        processed_batch = []
+        frame_numbers = []
+        pending_alerts = []
+        batch_alerts = []
+        # Email/SMS at most once per action per cooldown window of video time
+        notify_cooldown = config['alerts'].get('notification_cooldown', 60)
+        last_notified = {}
+
+        def handle_result(result, frame_number):
+            if result.get('alert') and result.get('is_unsafe'):
+                action = result['action']
+                confidence = result['confidence']
+                
+                logger.warning(
+                    f"[Video {video_id}] UNSAFE ACTION DETECTED at frame {frame_number}: "
+                    f"{action} (confidence: {confidence:.2%})"
+                )
 
-            alert_config = db.query(AlertConfig).filter(
-                AlertConfig.user_id == user_id
-            ).first()
-            
-            # Get project for severity filtering
-            project = None
-            if project_id:
-                project = db.query(Project).filter(Project.id == project_id).first()
+                video_time = frame_number / fps if fps > 0 else 0
+                notify = video_time - last_notified.get(action, -notify_cooldown) >= notify_cooldown
 
-            import cv2
-            cap = cv2.VideoCapture(video_path)
-            
-            if not cap.isOpened():
-                raise Exception(f"Failed to open video file: {video_path}")
-
-            # Get video properties for progress tracking
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS) or 30
-            duration_sec = total_frames / fps if fps > 0 else 0
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            
-            logger.info(f"[Video {video_id}] Video info: {total_frames} frames, {fps:.1f} FPS, {duration_sec:.1f}s duration, {width}x{height}")
+                if (alert_email or alert_phone) and notify:
+                    last_notified[action] = video_time
+
+                    if alert_email:
+                        batch_alerts.append(_send_email(alert_email, action, confidence, filename))
 
-            unsafe_actions_detected = []
-            frame_count = 0
-            last_progress_log = 0
-            progress_interval = max(1, total_frames // 10)  # Log every 10%
-            start_time = time.time()
+                    if alert_phone:
+                        batch_alerts.append(_send_sms(alert_phone, action, confidence, filename))
 
+                unsafe_actions_detected.append({
+                    "action": action,
+                    "confidence": float(confidence),
+                    "frame": frame_number,
+                    "timestamp": time.time() - start_time  # Seconds into the job, formatted once at the end
+                })
+
+        # Decoding runs on its own thread and feeds a bounded queue, so the CPU decodes the next
+        # frames while the GPU works on the current batch (the queue caps memory held in flight)
+        frame_queue = queue.Queue(maxsize=2 * batch_size)
+        stop_decoding = threading.Event()
+        decode_errors = []
+        frames_read = [0]
+
+        def enqueue(item):
+            while not stop_decoding.is_set():
+                try:
+                    frame_queue.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+
+        def decode_loop():
+            last_analysed = None
             try:
-                while True:
+                while not stop_decoding.is_set():
+                    # Every `stride`-th frame is a keyframe; without a motion threshold the rest are skipped with grab()
+                    keyframe = frames_read[0] % stride == 0
+                    if not keyframe and motion_threshold is None:
+                        if not cap.grab():
+                            break
+                        frames_read[0] += 1
+                        continue
+
                     ret, frame = cap.read()
                     if not ret:
                         break
-                    
-                    frame_count += 1
+                    frames_read[0] += 1
+                    if not keyframe and frame_difference(frame, last_analysed) <= motion_threshold:
+                        continue
+                    last_analysed = frame
+                    # Resize/normalize here too, so it overlaps inference instead of delaying the next batch
+                    enqueue((frames_read[0], frame, detector.video_buffer.preprocess(frame)))
+            except Exception as decode_err:
+                decode_errors.append(decode_err)
+            finally:
+                enqueue(None)  # End-of-video sentinel
+
+        decode_thread = threading.Thread(target=decode_loop, name=f"decode-{video_id}", daemon=True)
+        decode_thread.start()
+
+        try:
+            while True:
+                if _shutting_down.is_set():
+                    logger.info(f"[Video {video_id}] Server shutting down - will resume on restart")
+                    return
+                
+                item = frame_queue.get()
+
+                if item is not None:
+                    frame_count, frame, processed = item
                     
                     # Log progress every 10% or at least every 100 frames
-                    if frame_count - last_progress_log >= progress_interval or frame_count == 1:
+                    if frame_count - last_progress_log >= progress_interval or last_progress_log == 0:
                         elapsed = time.time() - start_time
                         progress_pct = (frame_count / total_frames * 100) if total_frames > 0 else 0
                         frames_per_sec = frame_count / elapsed if elapsed > 0 else 0
@@ -1139,76 +1634,152 @@ async def process_video_task(
                         )
                         last_progress_log = frame_count
 
-                    result = detector.process_frame(frame)
+                    frame_batch.append(frame)
+                    processed_batch.append(processed)
+                    frame_numbers.append(frame_count)
+                    if len(frame_batch) < batch_size:
+                        continue
+
+                # Run one forward pass per full batch (and flush the partial batch at end of video)
+                if frame_batch:
+                    results = detector.process_batch(frame_batch, processed_batch)
+                    for frame_number, result in zip(frame_numbers, results):
+                        handle_result(result, frame_number)
+                    # Alerts raised by one batch go out together as a single fan-out
+                    if batch_alerts:
+                        pending_alerts.append(asyncio.run_coroutine_threadsafe(
+                            _deliver_alerts(batch_alerts), _notify_loop
+                        ))
+                        batch_alerts = []
+                    frame_batch = []
+                    processed_batch = []
+                    frame_numbers = []
+
+                if item is None:
+                    break
+
+            if decode_errors:
+                raise decode_errors[0]
+            frame_count = frames_read[0]
+                    
+            # Log completion
+            elapsed = time.time() - start_time
+            avg_fps = frame_count / elapsed if elapsed > 0 else 0
+            logger.info(
+                f"[Video {video_id}] Processing complete: {frame_count} frames in {elapsed:.1f}s "
+                f"(avg {avg_fps:.1f} fps)"
+            )
+        finally:
+            # Let in-flight alerts finish before the job is reported as done
+            wait_futures(pending_alerts)
+            stop_decoding.set()
+            decode_thread.join()
+            cap.release()
+
+        for detection in unsafe_actions_detected:
+            detection["timestamp"] = (started_at + timedelta(seconds=detection["timestamp"])).isoformat()
+
+        if unsafe_actions_detected:
+            video_record.status = "unsafe_detected"
+            video_record.result = {
+                "unsafe_actions": unsafe_actions_detected,
+                "total_detections": len(unsafe_actions_detected)
+            }
+            logger.warning(
+                f"[Video {video_id}] RESULT: {len(unsafe_actions_detected)} unsafe actions detected"
+            )
+        else:
+            video_record.status = "safe"
+            video_record.result = {
+                "unsafe_actions": [],
+                "total_detections": 0
+            }
+            logger.info(f"[Video {video_id}] RESULT: No unsafe actions detected - video is safe")
 
-                    if result.get('alert') and result.get('is_unsafe'):
-                        action = result['action']
-                        confidence = result['confidence']
-                        
-                        logger.warning(
-                            f"[Video {video_id}] UNSAFE ACTION DETECTED at frame {frame_count}: "
-                            f"{action} (confidence: {confidence:.2%})"
-                        )
+        video_record.processed_at = datetime.utcnow()
+        db.commit()
+        logger.info(f"[Video {video_id}] Processing finished successfully")
 
-                        if alert_config:
-                            if alert_config.enable_email and alert_config.email:
-                                _send_email(alert_config, action, confidence, video_record.filename)
-
-                            if alert_config.enable_sms and alert_config.phone:
-                                _send_sms(alert_config, action, confidence, video_record.filename)
-
-                        unsafe_actions_detected.append({
-                            "action": action,
-                            "confidence": float(confidence),
-                            "frame": frame_count,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                        
-                # Log completion
-                elapsed = time.time() - start_time
-                avg_fps = frame_count / elapsed if elapsed > 0 else 0
-                logger.info(
-                    f"[Video {video_id}] Processing complete: {frame_count} frames in {elapsed:.1f}s "
-                    f"(avg {avg_fps:.1f} fps)"
-                )
-            finally:
-                cap.release()
+    except Exception as e:
+        logger.error(f"[Video {video_id}] ERROR during processing: {str(e)}", exc_info=True)
+        video_record = db.query(VideoProcessing).filter(
+            VideoProcessing.id == video_id
+        ).first()
+        if video_record:
+            video_record.status = "error"
+            video_record.result = {"error": str(e)}
+            db.commit()
+        logger.error(f"[Video {video_id}] Marked as error in database")
+    finally:
+        db.close()
 
-            if unsafe_actions_detected:
-                video_record.status = "unsafe_detected"
-                video_record.result = json.dumps({
-                    "unsafe_actions": unsafe_actions_detected,
-                    "total_detections": len(unsafe_actions_detected)
-                })
-                logger.warning(
-                    f"[Video {video_id}] RESULT: {len(unsafe_actions_detected)} unsafe actions detected"
-                )
-            else:
-                video_record.status = "safe"
-                video_record.result = json.dumps({
-                    "unsafe_actions": [],
-                    "total_detections": 0
-                })
-                logger.info(f"[Video {video_id}] RESULT: No unsafe actions detected - video is safe")
 
-            video_record.processed_at = datetime.utcnow()
-            db.commit()
-            logger.info(f"[Video {video_id}] Processing finished successfully")
+# Persistent queue: with a broker configured, uploads are processed by Celery workers
+# (celery -A backend.app.celery_app worker -P solo --concurrency=1) and survive API restarts
+if celery_app is not None:
+    process_video_job = celery_app.task(
+        name="process_video",
+        acks_late=True,
+        reject_on_worker_lost=True,
+        ignore_result=True
+    )(run_video_processing)
+
+
+async def process_video_task(
+    video_id: str,
+    video_path: str,
+    user_id: str,
+    project_id: Optional[int] = None,
+):
+    """Process video in a worker thread so the event loop stays responsive."""
+    async with _video_semaphore:
+        await asyncio.to_thread(run_video_processing, video_id, video_path, user_id, project_id)
+
+
+def _start_video_task(video_id: str, video_path: str, user_id: str, project_id: Optional[int] = None):
+    """Schedule process_video_task on the running loop and hold a reference until it finishes"""
+    task = asyncio.create_task(process_video_task(video_id, video_path, user_id, project_id))
+    _video_tasks.add(task)
+    task.add_done_callback(_video_tasks.discard)
+    return task
 
-        except Exception as e:
-            logger.error(f"[Video {video_id}] ERROR during processing: {str(e)}", exc_info=True)
-            video_record = db.query(VideoProcessing).filter(
-                VideoProcessing.id == video_id
-            ).first()
-            if video_record:
-                video_record.status = "error"
-                video_record.result = json.dumps({"error": str(e)})
-                db.commit()
-            logger.error(f"[Video {video_id}] Marked as error in database")
-        finally:
-            db.close()
 
-    await asyncio.to_thread(worker)
+def _store_upload(src, dest_path) -> str:
+    """
+    Copy a spooled upload to disk in large chunks and return its SHA-256 hex digest
+    (blocking - run it in the threadpool)
+    """
+    # Uploads over the spool threshold already sit in a temp file: the kernel copies those with
+    # sendfile and only the hash reads the data into Python. _rolled/_file are private
+    # SpooledTemporaryFile attributes, so anything else takes the chunked copy below
+    spool = getattr(src, "_file", None)
+    if getattr(src, "_rolled", False) and spool is not None and hasattr(os, "sendfile"):
+        spool.flush()
+        spool.seek(0)
+        content_hash = hashlib.sha256()
+        while chunk := spool.read(FILE_CHUNK_SIZE):
+            content_hash.update(chunk)
+        spool.seek(0)
+        digest = content_hash.hexdigest()
+        
+        size = os.fstat(spool.fileno()).st_size
+        with open(dest_path, "wb") as dst:
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), spool.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        return digest
+    
+    # Small uploads are still in memory
+    content_hash = hashlib.sha256()
+    src.seek(0)
+    with open(dest_path, "wb") as dst:
+        while chunk := src.read(FILE_CHUNK_SIZE):
+            content_hash.update(chunk)
+            dst.write(chunk)
+    return content_hash.hexdigest()
 
 
 @app.post("/videos/upload", response_model=VideoUploadResponse)
@@ -1223,17 +1794,11 @@ async def upload_video(
     Video will be processed in background and alerts sent if unsafe actions detected
     """
     # Validate project if provided
-    if project_id:
-        project = db.query(Project).filter(
-            Project.id == project_id,
-            Project.user_id == current_user.id
-        ).first()
-        
-        if not project:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Project not found"
-            )
+    if project_id and not _owns_project(db, project_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
     
     # Validate file type
     if not file.content_type.startswith("video/"):
@@ -1242,47 +1807,70 @@ async def upload_video(
             detail="File must be a video"
         )
     
+    # Oversize uploads were already turned away by UploadSizeLimitMiddleware
+    
     # Create uploads directory
     upload_dir = Path("backend/uploads")
     upload_dir.mkdir(parents=True, exist_ok=True)
     
     # Generate unique filename
-    import uuid
-    video_id = str(uuid.uuid4())
+    video_id = uuid4().hex
     file_extension = Path(file.filename).suffix
     video_filename = f"{video_id}{file_extension}"
     video_path = upload_dir / video_filename
     
-    # Save uploaded file in chunks to avoid blocking the event loop
-    with open(video_path, "wb") as f:
-        while True:
-            chunk = await file.read(1024 * 1024)
-            if not chunk:
-                break
-            f.write(chunk)
+    # Copy and hash the whole upload in one worker thread, so the event loop never waits on it
+    digest = await run_in_threadpool(_store_upload, file.file, video_path)
     await file.close()
     
-    # Create video processing record
-    video_record = VideoProcessing(
+    # Identical video already analysed for this user/project: reuse its result instead of re-processing
+    previous = db.execute(
+        select(VideoProcessing.id, VideoProcessing.status, VideoProcessing.result)
+        .where(
+            VideoProcessing.content_hash == digest,
+            VideoProcessing.user_id == current_user.id,
+            VideoProcessing.project_id == project_id,
+            VideoProcessing.status.in_(("safe", "unsafe_detected"))
+        )
+        .order_by(VideoProcessing.processed_at.desc())
+        .limit(1)
+    ).first()
+    
+    # Create video processing record (Core insert: no ORM instance to track, one commit)
+    values = dict(
         id=video_id,
         user_id=current_user.id,
         project_id=project_id,
         filename=file.filename,
         filepath=str(video_path),
-        status="uploaded"
+        status="uploaded",
+        content_hash=digest
     )
-    db.add(video_record)
+    if previous:
+        values.update(status=previous.status, result=previous.result, processed_at=datetime.utcnow())
+    db.execute(insert(VideoProcessing).values(**values))
     db.commit()
     
+    if previous:
+        logger.info(f"[Video {video_id}] Duplicate of video {previous.id}, reusing its result")
+        return VideoUploadResponse(
+            video_id=video_id,
+            filename=file.filename,
+            status=values["status"],
+            message="Identical video was already processed. Reusing previous result."
+        )
+    
     # Kick off processing without blocking the response cycle
-    asyncio.create_task(
-        process_video_task(
+    if celery_app is not None:
+        await run_in_threadpool(
+            process_video_job.delay,
             video_id,
             str(video_path),
             current_user.id,
             project_id,
         )
-    )
+    else:
+        _start_video_task(video_id, str(video_path), current_user.id, project_id)
     
     return VideoUploadResponse(
         video_id=video_id,
@@ -1296,13 +1884,18 @@ async def upload_video(
 async def get_video_status(
     video_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get video processing status and results"""
-    video = db.query(VideoProcessing).filter(
+    # Project, jurisdiction and industry come back joined onto the video in one SELECT
+    result = await db.execute(select(VideoProcessing).options(
+        joinedload(VideoProcessing.project).joinedload(Project.jurisdiction),
+        joinedload(VideoProcessing.project).joinedload(Project.industry)
+    ).where(
         VideoProcessing.id == video_id,
         VideoProcessing.user_id == current_user.id
-    ).first()
+    ))
+    video = result.scalar_one_or_none()
     
     if not video:
         raise HTTPException(
@@ -1310,36 +1903,35 @@ async def get_video_status(
             detail="Video not found"
         )
     
-    result_data = json.loads(video.result) if video.result else {}
+    result_data = video.result or {}
     
     # Get project information if associated
     project_info = None
-    if video.project_id:
-        project = db.query(Project).filter(Project.id == video.project_id).first()
-        if project:
-            jurisdiction = db.query(Jurisdiction).filter(Jurisdiction.id == project.jurisdiction_id).first()
-            industry = db.query(Industry).filter(Industry.id == project.industry_id).first()
-            project_info = {
-                "id": project.id,
-                "name": project.name,
-                "jurisdiction": {
-                    "id": jurisdiction.id,
-                    "name": jurisdiction.name,
-                    "code": jurisdiction.code
-                } if jurisdiction else None,
-                "industry": {
-                    "id": industry.id,
-                    "name": industry.name,
-                    "code": industry.code
-                } if industry else None
-            }
+    project = video.project
+    if project:
+        jurisdiction = project.jurisdiction
+        industry = project.industry
+        project_info = {
+            "id": project.id,
+            "name": project.name,
+            "jurisdiction": {
+                "id": jurisdiction.id,
+                "name": jurisdiction.name,
+                "code": jurisdiction.code
+            } if jurisdiction else None,
+            "industry": {
+                "id": industry.id,
+                "name": industry.name,
+                "code": industry.code
+            } if industry else None
+        }
     
     return {
         "video_id": video.id,
         "filename": video.filename,
         "status": video.status,
-        "uploaded_at": video.uploaded_at.isoformat(),
-        "processed_at": video.processed_at.isoformat() if video.processed_at else None,
+        "uploaded_at": video.uploaded_at,
+        "processed_at": video.processed_at,
         "result": result_data,
         "filepath": video.filepath,
         "project": project_info
@@ -1385,15 +1977,15 @@ async def update_video(
     db.refresh(video)
     
     # Return updated video data (same format as get_video_status)
-    result_data = json.loads(video.result) if video.result else {}
+    result_data = video.result or {}
     
     # Get project information if associated
     project_info = None
     if video.project_id:
-        project = db.query(Project).filter(Project.id == video.project_id).first()
+        project = db.get(Project, video.project_id)
         if project:
-            jurisdiction = db.query(Jurisdiction).filter(Jurisdiction.id == project.jurisdiction_id).first()
-            industry = db.query(Industry).filter(Industry.id == project.industry_id).first()
+            jurisdiction = db.get(Jurisdiction, project.jurisdiction_id)
+            industry = db.get(Industry, project.industry_id)
             project_info = {
                 "id": project.id,
                 "name": project.name,
@@ -1413,45 +2005,41 @@ async def update_video(
         "video_id": video.id,
         "filename": video.filename,
         "status": video.status,
-        "uploaded_at": video.uploaded_at.isoformat(),
-        "processed_at": video.processed_at.isoformat() if video.processed_at else None,
+        "uploaded_at": video.uploaded_at,
+        "processed_at": video.processed_at,
         "result": result_data,
         "filepath": video.filepath,
         "project": project_info
     }
 
 
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+
+# GZipMiddleware passes responses that already declare an encoding through untouched. Video and
+# JPEG are compressed already, and gzipping a streamed body would drop Content-Length (breaking
+# seeking) and hold MJPEG parts back in the deflate buffer
+NO_COMPRESSION_HEADERS = {"Content-Encoding": "identity"}
+
+
+class VideoFileResponse(FileResponse):
+    """FileResponse that reads FILE_CHUNK_SIZE blocks, one thread-pool hop per block instead of per 64 KiB"""
+    chunk_size = FILE_CHUNK_SIZE
+
+    def __init__(self, *args, headers=None, **kwargs):
+        super().__init__(*args, headers={**NO_COMPRESSION_HEADERS, **(headers or {})}, **kwargs)
+
 
 async def get_user_from_token(token: str, db: Session) -> User:
     """Verify token and return user"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
-    except jwt.PyJWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    return user
+    return await _resolve_user(token, db)
 
 
 @app.get("/videos/{video_id}/download")
 async def download_video(
     video_id: str,
     token: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Download the original video file"""
@@ -1476,12 +2064,85 @@ async def download_video(
             detail="Video file not found on server"
         )
     
-    return FileResponse(
-        path=str(video_path),
+    # Ranged so interrupted downloads can resume
+    return _ranged_file_response(
+        video_path,
+        request.headers.get("range"),
         media_type='video/mp4',
         filename=video.filename,
+        disposition="attachment"
+    )
+
+
+def _parse_byte_range(range_header: str, file_size: int):
+    """Parse a single 'bytes=start-end' Range header, returns (start, end) inclusive or None if unsatisfiable"""
+    unit, _, spec = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    
+    start_str, _, end_str = spec.strip().partition("-")
+    try:
+        if start_str:
+            start = int(start_str)
+            end = int(end_str) if end_str else file_size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(file_size - int(end_str), 0)
+            end = file_size - 1
+    except ValueError:
+        return None
+    
+    end = min(end, file_size - 1)
+    if start > end:
+        return None
+    return start, end
+
+
+def _ranged_file_response(path: Path, range_header: Optional[str], media_type: str, filename: str, disposition: str = "inline"):
+    """Serve a file honouring HTTP Range requests so browsers can seek and clients can resume without re-downloading"""
+    file_size = path.stat().st_size
+    
+    if not range_header:
+        return VideoFileResponse(
+            path=str(path),
+            media_type=media_type,
+            filename=filename,
+            headers={"Accept-Ranges": "bytes"},
+            content_disposition_type=disposition
+        )
+    
+    byte_range = _parse_byte_range(range_header, file_size)
+    if byte_range is None:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{file_size}"}
+        )
+    start, end = byte_range
+    
+    async def iter_range():
+        # Positional reads: one thread-pool hop per chunk, no separate seek
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            offset = start
+            while offset <= end:
+                chunk = await run_in_threadpool(os.pread, fd, min(FILE_CHUNK_SIZE, end - offset + 1), offset)
+                if not chunk:
+                    break
+                offset += len(chunk)
+                yield chunk
+        finally:
+            os.close(fd)
+    
+    return StreamingResponse(
+        iter_range(),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
         headers={
-            "Content-Disposition": f"attachment; filename={video.filename}"
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end}/{file_size}",
+            "Content-Length": str(end - start + 1),
+            "Content-Disposition": f"{disposition}; filename*=utf-8''{quote(filename)}",
+            **NO_COMPRESSION_HEADERS
         }
     )
 
@@ -1490,6 +2151,7 @@ async def download_video(
 async def stream_video(
     video_id: str,
     token: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Stream video for playback in browser"""
@@ -1514,8 +2176,9 @@ async def stream_video(
             detail="Video file not found on server"
         )
     
-    return FileResponse(
-        path=str(video_path),
+    return _ranged_file_response(
+        video_path,
+        request.headers.get("range"),
         media_type='video/mp4',
         filename=video.filename
     )
@@ -1524,43 +2187,79 @@ async def stream_video(
 @app.get("/videos")
 async def list_videos(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    limit: int = 50,
-    offset: int = 0
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    project_id: Optional[int] = None
 ):
-    """List user's uploaded videos"""
-    videos = db.query(VideoProcessing).filter(
-        VideoProcessing.user_id == current_user.id
-    ).order_by(VideoProcessing.uploaded_at.desc()).limit(limit).offset(offset).all()
+    """List user's uploaded videos, optionally only those in one project"""
+    # COUNT(*) OVER () returns the total alongside the page, and the join brings each
+    # video's project name, all in a single query. Only listed columns are selected, so the
+    # (potentially large) detection result JSON is never loaded or decoded for a listing.
+    # The count and pagination run on videos alone (served by ix_video_user_time); only the
+    # page's rows are joined to their projects.
+    video_filter = [VideoProcessing.user_id == current_user.id]
+    if project_id is not None:
+        video_filter.append(VideoProcessing.project_id == project_id)
+    
+    page = (
+        select(
+            VideoProcessing.id,
+            VideoProcessing.filename,
+            VideoProcessing.status,
+            VideoProcessing.uploaded_at,
+            VideoProcessing.processed_at,
+            VideoProcessing.project_id,
+            func.count().over().label("total")
+        )
+        .where(*video_filter)
+        .order_by(VideoProcessing.uploaded_at.desc())
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    result = await db.execute(
+        select(page, Project.name.label("project_name"))
+        .outerjoin(Project, page.c.project_id == Project.id)
+        .order_by(page.c.uploaded_at.desc())
+    )
+    rows = result.all()
+    
+    if rows:
+        total = rows[0].total
+    elif offset:
+        # Paged past the end - the window count has no row to ride on
+        total = await db.scalar(
+            select(func.count()).select_from(VideoProcessing).where(*video_filter)
+        )
+    else:
+        total = 0
     
     video_list = []
-    for v in videos:
+    for v in rows:
         video_data = {
             "video_id": v.id,
             "filename": v.filename,
             "status": v.status,
-            "uploaded_at": v.uploaded_at.isoformat(),
-            "processed_at": v.processed_at.isoformat() if v.processed_at else None,
+            "uploaded_at": v.uploaded_at,
+            "processed_at": v.processed_at,
             "project": None
         }
         
         # Add project info if associated
-        if v.project_id:
-            project = db.query(Project).filter(Project.id == v.project_id).first()
-            if project:
-                video_data["project"] = {
-                    "id": project.id,
-                    "name": project.name
-                }
+        if v.project_name is not None:
+            video_data["project"] = {
+                "id": v.project_id,
+                "name": v.project_name
+            }
         
         video_list.append(video_data)
     
-    return {
+    # orjson handles dicts and datetimes natively - returning the response directly skips jsonable_encoder's per-item walk
+    return ORJSONResponse({
         "videos": video_list,
-        "total": db.query(VideoProcessing).filter(
-            VideoProcessing.user_id == current_user.id
-        ).count()
-    }
+        "total": total
+    })
 
 
 # ===== Live Streaming Endpoints =====
@@ -1576,12 +2275,7 @@ async def create_stream(
     Supports RTSP, RTMP, HTTP streams, and webcams
     """
     # Validate project exists and belongs to user
-    project = db.query(Project).filter(
-        Project.id == stream_data.project_id,
-        Project.user_id == current_user.id
-    ).first()
-    
-    if not project:
+    if not _owns_project(db, stream_data.project_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
@@ -1595,8 +2289,7 @@ async def create_stream(
         )
     
     # Generate unique stream ID
-    import uuid
-    stream_id = str(uuid.uuid4())
+    stream_id = uuid4().hex
     
     # Save stream to database with inactive status (not started yet)
     stream_db = StreamModel(
@@ -1635,7 +2328,7 @@ async def list_streams(
     
     for stream in streams:
         # Get project information
-        project = db.query(Project).filter(Project.id == stream.project_id).first()
+        project = db.get(Project, stream.project_id)
         
         # Get stream status from manager if available
         stream_status = manager.get_stream(stream.id)
@@ -1648,8 +2341,8 @@ async def list_streams(
             "source_type": stream.source_type,
             "status": stream.status,
             "fps": stream.fps,
-            "created_at": stream.created_at.isoformat(),
-            "updated_at": stream.updated_at.isoformat(),
+            "created_at": stream.created_at,
+            "updated_at": stream.updated_at,
             # Default values for stream stats
             "width": 0,
             "height": 0,
@@ -1711,7 +2404,7 @@ async def get_stream_status(
 ):
     """Get status and details of a specific stream"""
     # Get stream from database
-    stream_db = db.query(StreamModel).filter(StreamModel.id == stream_id).first()
+    stream_db = db.get(StreamModel, stream_id)
     
     if not stream_db:
         raise HTTPException(
@@ -1743,8 +2436,8 @@ async def get_stream_status(
         "source_type": stream_db.source_type,
         "status": stream_db.status,
         "fps": stream_db.fps,
-        "created_at": stream_db.created_at.isoformat(),
-        "updated_at": stream_db.updated_at.isoformat(),
+        "created_at": stream_db.created_at,
+        "updated_at": stream_db.updated_at,
         "width": 0,
         "height": 0,
         "frame_count": 0,
@@ -1799,7 +2492,7 @@ async def delete_stream(
     manager.remove_stream(stream_id)  # It's OK if it's not in the manager
     
     # Remove from database
-    stream_db = db.query(StreamModel).filter(StreamModel.id == stream_id).first()
+    stream_db = db.get(StreamModel, stream_id)
     if not stream_db:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1807,12 +2500,7 @@ async def delete_stream(
         )
     
     # Verify the stream belongs to one of the user's projects
-    project = db.query(Project).filter(
-        Project.id == stream_db.project_id,
-        Project.user_id == current_user.id
-    ).first()
-    
-    if not project:
+    if not _owns_project(db, stream_db.project_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to delete this stream"
@@ -1838,7 +2526,7 @@ async def update_stream(
     Stream must be stopped to change project
     """
     # Get stream from database
-    stream_db = db.query(StreamModel).filter(StreamModel.id == stream_id).first()
+    stream_db = db.get(StreamModel, stream_id)
     
     if not stream_db:
         raise HTTPException(
@@ -1847,12 +2535,7 @@ async def update_stream(
         )
     
     # Verify the stream belongs to one of the user's projects
-    current_project = db.query(Project).filter(
-        Project.id == stream_db.project_id,
-        Project.user_id == current_user.id
-    ).first()
-    
-    if not current_project:
+    if not _owns_project(db, stream_db.project_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to update this stream"
@@ -1900,12 +2583,7 @@ async def update_stream(
     # Update project if provided
     if stream_data.project_id is not None:
         # Verify new project exists and belongs to user
-        new_project = db.query(Project).filter(
-            Project.id == stream_data.project_id,
-            Project.user_id == current_user.id
-        ).first()
-        
-        if not new_project:
+        if not _owns_project(db, stream_data.project_id, current_user.id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="New project not found"
@@ -1936,7 +2614,7 @@ async def start_stream(
     Start a stream that was created but not started, or restart a stopped stream
     """
     # Get stream from database
-    stream_db = db.query(StreamModel).filter(StreamModel.id == stream_id).first()
+    stream_db = db.get(StreamModel, stream_id)
     
     if not stream_db:
         raise HTTPException(
@@ -1945,12 +2623,7 @@ async def start_stream(
         )
     
     # Verify the stream belongs to one of the user's projects
-    project = db.query(Project).filter(
-        Project.id == stream_db.project_id,
-        Project.user_id == current_user.id
-    ).first()
-    
-    if not project:
+    if not _owns_project(db, stream_db.project_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to start this stream"
@@ -2049,7 +2722,7 @@ async def stop_stream(
     Stop a running stream without deleting it from the database
     """
     # Get stream from database
-    stream_db = db.query(StreamModel).filter(StreamModel.id == stream_id).first()
+    stream_db = db.get(StreamModel, stream_id)
     
     if not stream_db:
         raise HTTPException(
@@ -2058,12 +2731,7 @@ async def stop_stream(
         )
     
     # Verify the stream belongs to one of the user's projects
-    project = db.query(Project).filter(
-        Project.id == stream_db.project_id,
-        Project.user_id == current_user.id
-    ).first()
-    
-    if not project:
+    if not _owns_project(db, stream_db.project_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to stop this stream"
@@ -2093,31 +2761,88 @@ async def stop_stream(
 @app.get("/streams/{stream_id}/frame")
 async def get_stream_frame(
     stream_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
     """
     Get current frame from stream as base64 encoded JPEG
     Used for polling-based video display in frontend
     """
-    manager = get_stream_manager()
-    frame_base64 = manager.get_stream_frame(stream_id, format='base64')
+    stream = get_stream_manager().get_stream(stream_id)
+    # Encoding (and waiting on another viewer's encode) happens off the event loop
+    encoded = await run_in_threadpool(stream.get_encoded_frame, True) if stream else None
     
-    if frame_base64 is None:
+    if encoded is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Stream not found or no frame available"
         )
     
-    return {
-        "stream_id": stream_id,
-        "frame": frame_base64,
-        "timestamp": datetime.now().isoformat()
-    }
+    # Pollers send back the ETag and skip the payload while the frame is unchanged
+    frame_seq, frame_time, frame_base64 = encoded[0], encoded[1], encoded[3]
+    etag = f'"{frame_seq}-{frame_time}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return ORJSONResponse(
+        {
+            "stream_id": stream_id,
+            "frame": frame_base64,
+            # ISO capture time of the frame (the stream's last_frame_time)
+            "timestamp": frame_time or datetime.now().isoformat()
+        },
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
+
+
+@app.websocket("/streams/{stream_id}/ws")
+async def stream_live_websocket(
+    websocket: WebSocket,
+    stream_id: str,
+    token: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Push each new annotated frame as a binary JPEG WebSocket message
+    Replaces polling /frame (base64 JSON) with one connection and no base64 overhead
+    """
+    # Authenticate using token from query param (browsers can't set WebSocket headers)
+    try:
+        user = await get_user_from_token(token, db)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    # Check if user owns the project this stream belongs to
+    stream_db = db.get(StreamModel, stream_id)
+    if not stream_db or not _owns_project(db, stream_db.project_id, user.id):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    stream = get_stream_manager().get_stream(stream_id)
+    if not stream or not stream.is_running:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    # The socket can stay open for hours; hand the pooled DB connection back before pushing frames
+    db.close()
+    
+    await websocket.accept()
+    try:
+        async for frame_jpeg in stream.jpeg_frames():
+            await websocket.send_bytes(frame_jpeg)
+    except (WebSocketDisconnect, OSError):
+        # Nothing is received here, so a closed tab surfaces on send (uvicorn's ClientDisconnected is an OSError)
+        return
+    
+    # Stream stopped: close our side, unless the client went away in the meantime
+    try:
+        await websocket.close()
+    except (RuntimeError, OSError):
+        pass
 
 
-from fastapi.responses import StreamingResponse, Response, FileResponse
 import subprocess
-import queue
 import tempfile
 import shutil
 from pathlib import Path
@@ -2137,7 +2862,7 @@ async def stream_live_video(
     user = await get_user_from_token(token, db)
     
     # Verify user has access to this stream
-    stream_db = db.query(StreamModel).filter(StreamModel.id == stream_id).first()
+    stream_db = db.get(StreamModel, stream_id)
     if not stream_db:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2145,12 +2870,7 @@ async def stream_live_video(
         )
     
     # Check if user owns the project this stream belongs to
-    project = db.query(Project).filter(
-        Project.id == stream_db.project_id,
-        Project.user_id == user.id
-    ).first()
-    
-    if not project:
+    if not _owns_project(db, stream_db.project_id, user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
@@ -2165,21 +2885,21 @@ async def stream_live_video(
             detail="Stream not active or not found"
         )
     
-    def generate():
-        """Generate MJPEG stream"""
+    # Release the pooled DB connection now; the response below lasts as long as the viewer watches
+    db.close()
+    
+    async def generate():
+        """Generate MJPEG stream, sending each new frame once as the capture thread produces it"""
         try:
-            while stream.is_running:
-                frame_jpeg = stream.get_frame_jpeg()
-                if frame_jpeg is not None:
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + frame_jpeg + b'\r\n')
-                time.sleep(1.0 / stream.config.fps)
+            async for part in stream.jpeg_frames(multipart=True):
+                yield part
         except Exception as e:
             logger.error(f"Error streaming video: {e}")
     
     return StreamingResponse(
         generate(),
-        media_type='multipart/x-mixed-replace; boundary=frame'
+        media_type=f'multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}',
+        headers=NO_COMPRESSION_HEADERS
     )
 
 
@@ -2202,7 +2922,8 @@ async def get_hls_playlist(
     stream_id: str,
     token: Optional[str] = None,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db)
 ):
     """
     Serve HLS playlist file (.m3u8) for a stream
@@ -2212,7 +2933,7 @@ async def get_hls_playlist(
     user = None
     if credentials:
         try:
-            user = await get_current_user(credentials, db)
+            user = await get_current_user(credentials, async_db)
         except:
             pass
     
@@ -2229,7 +2950,7 @@ async def get_hls_playlist(
         )
     
     # Verify user has access to this stream
-    stream_db = db.query(StreamModel).filter(StreamModel.id == stream_id).first()
+    stream_db = db.get(StreamModel, stream_id)
     if not stream_db:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2237,12 +2958,7 @@ async def get_hls_playlist(
         )
     
     # Check if user owns the project this stream belongs to
-    project = db.query(Project).filter(
-        Project.id == stream_db.project_id,
-        Project.user_id == user.id
-    ).first()
-    
-    if not project:
+    if not _owns_project(db, stream_db.project_id, user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
@@ -2290,7 +3006,8 @@ async def get_hls_segment(
     segment_name: str,
     token: Optional[str] = None,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db)
 ):
     """
     Serve HLS video segment (.ts file) for a stream
@@ -2307,7 +3024,7 @@ async def get_hls_segment(
     user = None
     if credentials:
         try:
-            user = await get_current_user(credentials, db)
+            user = await get_current_user(credentials, async_db)
         except:
             pass
     
@@ -2324,7 +3041,7 @@ async def get_hls_segment(
         )
     
     # Verify user has access to this stream
-    stream_db = db.query(StreamModel).filter(StreamModel.id == stream_id).first()
+    stream_db = db.get(StreamModel, stream_id)
     if not stream_db:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2332,12 +3049,7 @@ async def get_hls_segment(
         )
     
     # Check if user owns the project this stream belongs to
-    project = db.query(Project).filter(
-        Project.id == stream_db.project_id,
-        Project.user_id == user.id
-    ).first()
-    
-    if not project:
+    if not _owns_project(db, stream_db.project_id, user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
@@ -2353,7 +3065,7 @@ async def get_hls_segment(
             detail="Segment not found"
         )
     
-    return FileResponse(
+    return VideoFileResponse(
         segment_path,
         media_type='video/mp2t',
         headers={
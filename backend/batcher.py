@@ -0,0 +1,111 @@
+"""
+Dynamic batching of detector forward passes
+Clips submitted at the same time by video jobs and the live stream inference thread
+are merged into one forward pass instead of running back to back
+"""
+import contextlib
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ClipBatcher:
+    """
+    Coalesces concurrent clip predictions for one model into shared forward passes
+
+    Callers block in predict() as before. The first caller with nothing running becomes
+    the leader: it waits up to max_wait_ms for more clips (or until max_batch clips are
+    queued), runs them all in one pass and hands the results back to each caller.
+    Leadership passes on after every pass, so no caller serves others' clips once its own are done.
+    """
+
+    def __init__(self, max_batch: int = 32, max_wait_ms: float = 10.0, gate=None):
+        """
+        Args:
+            max_batch: Clips per merged forward pass (a single larger request still runs whole)
+            max_wait_ms: How long a leader waits for other callers before running what it has
+            gate: Optional context manager held around each forward pass (e.g. a GPU semaphore)
+        """
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.gate = gate if gate is not None else contextlib.nullcontext()
+
+        self._cond = threading.Condition()
+        self._pending = []  # (detector, clips, Future) in arrival order
+        self._pending_clips = 0
+        self._leading = False
+
+    def predict(self, detector, clips) -> List[Tuple[int, float]]:
+        """
+        Predict a list of (1, T, C, H, W) clips, merged with whatever other callers submit meanwhile
+
+        Args:
+            detector: Detector (or fork) sharing this batcher's model
+            clips: List of clip tensors
+
+        Returns:
+            predictions: List of (action_class, confidence) tuples, one per clip
+        """
+        future = Future()
+        with self._cond:
+            self._pending.append((detector, clips, future))
+            self._pending_clips += len(clips)
+            self._cond.notify_all()
+
+            while not future.done():
+                if self._leading:
+                    self._cond.wait()
+                    continue
+
+                self._leading = True
+                group = self._collect()
+                self._cond.release()
+                try:
+                    self._run(group)
+                finally:
+                    self._cond.acquire()
+                    self._leading = False
+                    self._cond.notify_all()
+
+        return future.result()
+
+    def _collect(self):
+        """Wait for the batch to fill (or max_wait to pass) and take the oldest requests (lock held)"""
+        deadline = time.monotonic() + self.max_wait
+        while self._pending_clips < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._cond.wait(remaining)
+
+        group = []
+        size = 0
+        while self._pending and (not group or size + len(self._pending[0][1]) <= self.max_batch):
+            request = self._pending.pop(0)
+            group.append(request)
+            size += len(request[1])
+        self._pending_clips -= size
+        return group
+
+    def _run(self, group):
+        """Run one forward pass for a group of requests and resolve their futures"""
+        clips = [clip for _, request_clips, _ in group for clip in request_clips]
+        try:
+            with self.gate:
+                predictions = group[0][0].forward_clips(clips)
+        except Exception as e:
+            for _, _, future in group:
+                future.set_exception(e)
+            return
+
+        if len(group) > 1:
+            logger.debug(f"Merged {len(group)} requests into one forward pass of {len(clips)} clips")
+
+        start = 0
+        for _, request_clips, future in group:
+            future.set_result(predictions[start:start + len(request_clips)])
+            start += len(request_clips)
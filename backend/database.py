@@ -1,21 +1,70 @@
 """
 Database models and configuration for Workplace Safety Monitoring
 """
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from datetime import datetime
 import os
+import json
+import orjson
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./backend/workplace_safety.db")
 
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+def _json_serializer(value) -> str:
+    """Encode JSON columns with orjson (large detection results serialize several times faster)"""
+    return orjson.dumps(value).decode()
+
+
+def _json_deserializer(text: str):
+    """Decode JSON columns with orjson, falling back to json for legacy rows orjson rejects (e.g. NaN)"""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
+if "sqlite" in DATABASE_URL:
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer
+    )
+else:
+    # Server databases: room for API requests plus video workers, and drop connections the server closed
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        pool_pre_ping=True,
+        isolation_level="READ COMMITTED",
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer
+    )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto the matching asyncio driver"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith(("postgresql:", "postgresql+psycopg2:")):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    return url
+
+
+# Async engine for request handlers so DB I/O yields to the event loop
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_database_url(DATABASE_URL))
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, json_serializer=_json_serializer, json_deserializer=_json_deserializer
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -82,7 +131,7 @@ class Industry(Base):
     name = Column(String, nullable=False)  # e.g., "Food Safety"
     code = Column(String, unique=True, nullable=False, index=True)  # e.g., "food_safety"
     description = Column(Text, nullable=True)
-    hazard_categories = Column(Text, nullable=True)  # JSON string
+    hazard_categories = Column(JSON, nullable=True)  # List of hazard category names (decoded by the ORM)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -102,7 +151,7 @@ class Project(Base):
     jurisdiction_id = Column(Integer, ForeignKey("jurisdictions.id"), nullable=False)
     industry_id = Column(Integer, ForeignKey("industries.id"), nullable=False)
     model_path = Column(String, nullable=True)  # Custom model path (optional)
-    confidence_threshold_override = Column(String, nullable=True)  # JSON for custom thresholds
+    confidence_threshold_override = Column(JSON, nullable=True)  # Custom thresholds (stored as JSON text on SQLite)
     min_severity_alert = Column(Integer, default=1)  # Minimum severity level to trigger alerts (1-5)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -126,7 +175,7 @@ class JurisdictionRegulation(Base):
     regulation_code = Column(String, nullable=False)  # e.g., "OHSA_25(2)(h)"
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
-    violation_mapping = Column(Text, nullable=True)  # JSON mapping unsafe actions to violations
+    violation_mapping = Column(JSON, nullable=True)  # Mapping of unsafe actions to violations (decoded by the ORM)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -186,6 +235,11 @@ class Stream(Base):
     
     # Relationships
     project = relationship("Project", back_populates="streams")
+    
+    # Serves per-project stream counts and listings
+    __table_args__ = (
+        Index("ix_stream_project", project_id),
+    )
 
 
 class VideoProcessing(Base):
@@ -198,13 +252,23 @@ class VideoProcessing(Base):
     filename = Column(String, nullable=False)
     filepath = Column(String, nullable=False)
     status = Column(String, default="uploaded")  # uploaded, processing, safe, unsafe_detected, error
-    result = Column(Text, nullable=True)  # JSON string with detection results
+    result = Column(JSON, nullable=True)  # Detection results (stored as JSON text on SQLite)
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the uploaded file, used for dedup
     uploaded_at = Column(DateTime, default=datetime.utcnow)
     processed_at = Column(DateTime, nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="videos")
     project = relationship("Project", back_populates="videos")
+    
+    # Serve list_videos and get_project's video page (filter by user/project, newest first) as
+    # index range scans; per-project video counts and status breakdowns are answered from the
+    # (project_id, status) index alone
+    __table_args__ = (
+        Index("ix_video_user_time", user_id, uploaded_at.desc()),
+        Index("ix_video_project_time", project_id, uploaded_at.desc()),
+        Index("ix_video_project_status", project_id, status),
+    )
 
 
 # Create all tables
@@ -223,6 +287,12 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 if __name__ == "__main__":
     # Create database tables
     print("Creating database tables...")
@@ -10,7 +10,6 @@ from backend.database import (
     SessionLocal, init_db, 
     User, Project, Jurisdiction, Industry, VideoProcessing
 )
-import json
 
 
 def run_migration():
@@ -60,11 +59,11 @@ def run_migration():
                 name="General",
                 code="general",
                 description="General workplace safety applicable to all industries",
-                hazard_categories=json.dumps([
+                hazard_categories=[
                     "general_safety",
                     "workplace_hazards",
                     "emergency_preparedness"
-                ]),
+                ],
                 is_active=True
             )
             db.add(generic_industry)
@@ -0,0 +1,17 @@
+"""
+Migration: Add project_id indexes to video_processing and streams tables
+"""
+from schema_upgrade import create_index, run_migration
+
+STEPS = [
+    create_index("video_processing", "ix_video_project_status", "project_id, status"),
+    create_index("streams", "ix_stream_project", "project_id"),
+]
+
+def migrate():
+    """Create ix_video_project_status and ix_stream_project indexes"""
+    return run_migration(STEPS)
+
+if __name__ == "__main__":
+    success = migrate()
+    exit(0 if success else 1)
@@ -0,0 +1,18 @@
+"""
+Migration: Add content_hash column to video_processing table
+Videos uploaded before this migration have no hash and are never matched as duplicates
+"""
+from schema_upgrade import add_column, create_index, run_migration
+
+STEPS = [
+    add_column("video_processing", "content_hash", "VARCHAR(64)"),
+    create_index("video_processing", "ix_video_processing_content_hash", "content_hash"),
+]
+
+def migrate():
+    """Add content_hash column and its index to video_processing table"""
+    return run_migration(STEPS)
+
+if __name__ == "__main__":
+    success = migrate()
+    exit(0 if success else 1)
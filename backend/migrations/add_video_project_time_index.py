@@ -0,0 +1,16 @@
+"""
+Migration: Add (project_id, uploaded_at DESC) index to video_processing table
+"""
+from schema_upgrade import create_index, run_migration
+
+STEPS = [
+    create_index("video_processing", "ix_video_project_time", "project_id, uploaded_at DESC"),
+]
+
+def migrate():
+    """Create ix_video_project_time index on video_processing"""
+    return run_migration(STEPS)
+
+if __name__ == "__main__":
+    success = migrate()
+    exit(0 if success else 1)
@@ -0,0 +1,61 @@
+"""
+Idempotent schema upgrades for existing databases
+Runs through the configured engine (DATABASE_URL), so SQLite and PostgreSQL get the same changes
+"""
+import os
+import sys
+
+from sqlalchemy import inspect, text
+
+# Migration scripts are run directly (python backend/migrations/<name>.py) from the project root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from backend.database import engine
+
+
+def add_column(table: str, column: str, ddl_type: str):
+    """Step that adds `column` to `table` unless it already exists"""
+    def exists(inspector):
+        return column in {col["name"] for col in inspector.get_columns(table)}
+    return table, f"column '{column}'", exists, f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"
+
+
+def create_index(table: str, name: str, columns: str):
+    """Step that creates index `name` on `table` (columns as SQL, e.g. 'user_id, uploaded_at DESC') unless it exists"""
+    def exists(inspector):
+        return name in {idx["name"] for idx in inspector.get_indexes(table)}
+    return table, f"index '{name}'", exists, f"CREATE INDEX {name} ON {table} ({columns})"
+
+
+def run_migration(steps) -> bool:
+    """
+    Apply each step that is not already in place, all in one transaction
+
+    Args:
+        steps: List of add_column / create_index steps, applied in order
+
+    Returns:
+        success: Whether the schema now has every step applied
+    """
+    try:
+        with engine.begin() as conn:
+            for table, label, exists, ddl in steps:
+                # Fresh inspector per step: an earlier step may have changed the table
+                inspector = inspect(conn)
+                if not inspector.has_table(table):
+                    print(f"Table '{table}' not found - create the database with init_db() first")
+                    return False
+
+                if exists(inspector):
+                    print(f"{label.capitalize()} already exists on {table} table")
+                    continue
+
+                print(f"Adding {label} to {table} table...")
+                conn.execute(text(ddl))
+
+        print("Migration complete")
+        return True
+
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return False
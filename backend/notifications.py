@@ -2,7 +2,9 @@
 Notification services for email and SMS alerts
 """
 import os
+import asyncio
 import smtplib
+from functools import lru_cache
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional
@@ -42,6 +44,12 @@ TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN", "")
 TWILIO_FROM_NUMBER = os.getenv("TWILIO_FROM_NUMBER", "")
 
 
+@lru_cache(maxsize=1)
+def get_twilio_client() -> TwilioClient:
+    """Shared Twilio client, so repeated alerts reuse its HTTP session"""
+    return TwilioClient(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+
+
 async def send_email_alert(
     to_email: str,
     action: str,
@@ -189,7 +197,8 @@ async def send_email_sendgrid(to_email: str, subject: str, html_content: str, te
         )
         
         sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
+        # The SendGrid client is blocking; keep it off the event loop
+        response = await asyncio.to_thread(sg.send, message)
         
         print(f"Email alert sent to {to_email} via SendGrid (status: {response.status_code})")
         return True
@@ -237,9 +246,9 @@ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 Please review immediately.
 """.strip()
         
-        # Send SMS using Twilio
-        client = TwilioClient(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-        message = client.messages.create(
+        # Send SMS using Twilio (blocking client, so it runs off the event loop)
+        message = await asyncio.to_thread(
+            get_twilio_client().messages.create,
             body=message_body,
             from_=TWILIO_FROM_NUMBER,
             to=to_phone
@@ -258,8 +267,6 @@ def send_email_notification(to_email: str, subject: str, body: str) -> bool:
     Synchronous wrapper to send a simple email notification
     Used for test emails and simple notifications
     """
-    import asyncio
-    
     async def _send():
         return await send_email_smtp(to_email, subject, body, body)
     
@@ -287,8 +294,7 @@ def send_sms_notification(to_phone: str, message: str) -> bool:
         return False
     
     try:
-        client = TwilioClient(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-        twilio_message = client.messages.create(
+        twilio_message = get_twilio_client().messages.create(
             body=message,
             from_=TWILIO_FROM_NUMBER,
             to=to_phone
@@ -337,8 +343,6 @@ async def test_sms_configuration() -> bool:
 
 
 if __name__ == "__main__":
-    import asyncio
-    
     print("Testing notification services...")
     print("\n=== Email Configuration ===")
     print(f"SMTP Host: {SMTP_HOST}")
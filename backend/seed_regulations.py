@@ -9,7 +9,6 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.database import SessionLocal, init_db
 from backend.database import Jurisdiction, Industry, JurisdictionRegulation, ActionSeverity
-import json
 
 
 def seed_jurisdictions(db):
@@ -61,50 +60,50 @@ def seed_industries(db):
             "name": "Food Safety",
             "code": "food_safety",
             "description": "Food service, food processing, restaurants, and food handling facilities",
-            "hazard_categories": json.dumps([
+            "hazard_categories": [
                 "biological_contamination",
                 "cross_contamination",
                 "temperature_control",
                 "personal_hygiene",
                 "food_handling"
-            ]),
+            ],
             "is_active": True
         },
         {
             "name": "Construction",
             "code": "construction",
             "description": "Construction sites, building, renovation, and demolition work",
-            "hazard_categories": json.dumps([
+            "hazard_categories": [
                 "fall_protection",
                 "struck_by",
                 "electrical",
                 "caught_between",
                 "ppe_requirements"
-            ]),
+            ],
             "is_active": True
         },
         {
             "name": "Light Industry",
             "code": "light_industry",
             "description": "Manufacturing, workshops, automotive repair, mechanical work",
-            "hazard_categories": json.dumps([
+            "hazard_categories": [
                 "machinery_hazards",
                 "manual_handling",
                 "ppe_requirements",
                 "workshop_safety",
                 "equipment_operation"
-            ]),
+            ],
             "is_active": True
         },
         {
             "name": "General",
             "code": "general",
             "description": "General workplace safety applicable to all industries",
-            "hazard_categories": json.dumps([
+            "hazard_categories": [
                 "general_safety",
                 "workplace_hazards",
                 "emergency_preparedness"
-            ]),
+            ],
             "is_active": True
         }
     ]
@@ -141,11 +140,11 @@ def seed_ontario_regulations(db, jurisdictions, industries):
             "regulation_code": "OHSA_25(2)(h)",
             "title": "Personal Protective Equipment in Food Service",
             "description": "Workers handling food must use proper protective equipment including hairnets, gloves, and appropriate clothing",
-            "violation_mapping": json.dumps({
+            "violation_mapping": {
                 "no_hair_net": "OHSA_25(2)(h) - Failure to wear required head covering",
                 "no_gloves": "OHSA_25(2)(h) - Failure to wear required hand protection",
                 "improper_uniform": "OHSA_25(2)(h) - Not wearing appropriate clothing"
-            })
+            }
         },
         {
             "jurisdiction_id": ontario.id,
@@ -153,10 +152,10 @@ def seed_ontario_regulations(db, jurisdictions, industries):
             "regulation_code": "OHSA_26(1)",
             "title": "Food Handling and Cross-Contamination Prevention",
             "description": "Proper procedures to prevent cross-contamination between raw and cooked foods",
-            "violation_mapping": json.dumps({
+            "violation_mapping": {
                 "cross_contamination": "OHSA_26(1) - Unsafe food handling practices",
                 "improper_temperature_handling": "OHSA_26(1) - Failure to maintain safe temperatures"
-            })
+            }
         }
     ]
     
@@ -169,10 +168,10 @@ def seed_ontario_regulations(db, jurisdictions, industries):
             "regulation_code": "OHSA_26.1(1)",
             "title": "Head Protection on Construction Sites",
             "description": "Every worker on a construction site must wear appropriate head protection (hard hat)",
-            "violation_mapping": json.dumps({
+            "violation_mapping": {
                 "no_hard_hat": "OHSA_26.1(1) - Failure to wear required head protection",
                 "improper_hard_hat": "OHSA_26.1(1) - Wearing damaged or improper head protection"
-            })
+            }
         },
         {
             "jurisdiction_id": ontario.id,
@@ -180,10 +179,10 @@ def seed_ontario_regulations(db, jurisdictions, industries):
             "regulation_code": "OHSA_26.1(2)",
             "title": "Fall Protection Equipment",
             "description": "Workers at risk of falling must use proper fall protection equipment including safety harnesses",
-            "violation_mapping": json.dumps({
+            "violation_mapping": {
                 "no_safety_harness": "OHSA_26.1(2) - Failure to use fall protection equipment",
                 "unsafe_scaffolding": "OHSA_26.1(2) - Unsafe elevated work platform"
-            })
+            }
         },
         {
             "jurisdiction_id": ontario.id,
@@ -191,9 +190,9 @@ def seed_ontario_regulations(db, jurisdictions, industries):
             "regulation_code": "OHSA_26.1(3)",
             "title": "High Visibility Clothing",
             "description": "Workers must wear high visibility vests or clothing in traffic areas or where visibility is reduced",
-            "violation_mapping": json.dumps({
+            "violation_mapping": {
                 "no_high_visibility_vest": "OHSA_26.1(3) - Failure to wear required high visibility clothing"
-            })
+            }
         }
     ]
     
@@ -206,10 +205,10 @@ def seed_ontario_regulations(db, jurisdictions, industries):
             "regulation_code": "OHSA_25(1)(a)",
             "title": "Eye Protection in Workshops",
             "description": "Workers must wear appropriate eye protection when operating machinery or when there is a risk of eye injury",
-            "violation_mapping": json.dumps({
+            "violation_mapping": {
                 "no_safety_glasses": "OHSA_25(1)(a) - Failure to wear required eye protection",
                 "improper_eye_protection": "OHSA_25(1)(a) - Wearing inadequate eye protection"
-            })
+            }
         },
         {
             "jurisdiction_id": ontario.id,
@@ -217,11 +216,11 @@ def seed_ontario_regulations(db, jurisdictions, industries):
             "regulation_code": "OHSA_25(1)(c)",
             "title": "Clothing Around Machinery",
             "description": "Workers must not wear loose clothing, jewelry, or have long hair unsecured near moving machinery",
-            "violation_mapping": json.dumps({
+            "violation_mapping": {
                 "loose_clothing_near_machinery": "OHSA_25(1)(c) - Wearing loose clothing near machinery",
                 "unsecured_hair": "OHSA_25(1)(c) - Long hair not secured near machinery",
                 "jewelry_near_machinery": "OHSA_25(1)(c) - Wearing jewelry near machinery"
-            })
+            }
         },
         {
             "jurisdiction_id": ontario.id,
@@ -229,10 +228,10 @@ def seed_ontario_regulations(db, jurisdictions, industries):
             "regulation_code": "OHSA_25(2)(d)",
             "title": "Manual Handling and Lifting",
             "description": "Proper lifting techniques and mechanical aids must be used to prevent musculoskeletal injuries",
-            "violation_mapping": json.dumps({
+            "violation_mapping": {
                 "improper_lifting": "OHSA_25(2)(d) - Unsafe manual handling practices",
                 "overloading": "OHSA_25(2)(d) - Lifting excessive weight without assistance"
-            })
+            }
         }
     ]
     
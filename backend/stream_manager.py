@@ -16,6 +16,25 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+JPEG_QUALITY = 85
+MJPEG_BOUNDARY = "frame"
+MJPEG_PART_HEADER = b'--' + MJPEG_BOUNDARY.encode() + b'\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n'
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None  # PyTurboJPEG or libturbojpeg not installed, encode with OpenCV
+
+
+def encode_jpeg(frame: np.ndarray) -> Optional[bytes]:
+    """Encode a BGR frame as JPEG, with libjpeg-turbo's SIMD encoder when it is available"""
+    if _turbo_jpeg is not None:
+        return _turbo_jpeg.encode(frame, quality=JPEG_QUALITY, pixel_format=TJPF_BGR)
+    
+    ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    return buffer.tobytes() if ret else None
+
 
 @dataclass
 class StreamConfig:
@@ -38,10 +57,14 @@ class VideoStream:
     Manages a single video stream with real-time processing
     """
     
-    def __init__(self, config: StreamConfig, detector, alert_callback=None):
+    def __init__(self, config: StreamConfig, detector, alert_callback=None, frame_ready=None):
         self.config = config
         self.detector = detector
-        self.alert_callback = alert_callback
+        self.alert_callback = alert_callback  # Called as (stream_id, action, confidence); must not block
+        # Set when a frame is captured; StreamManager then runs inference for all streams in one batch.
+        # Without it, each frame is processed on the capture thread.
+        self.frame_ready = frame_ready
+        self._latest_frame = None  # Newest captured frame not yet taken for inference
         
         self.capture = None
         self.is_running = False
@@ -49,6 +72,11 @@ class VideoStream:
         self.current_frame = None
         self.current_result = None
         self.frame_lock = threading.Lock()
+        self.frame_seq = 0  # Bumped for every new annotated frame
+        self._frame_waiters = []  # (event loop, asyncio.Event) of viewers waiting for the next frame
+        # Encoded copies of the current frame, shared by every viewer: [frame_seq, frame_time, jpeg, base64_or_None, mjpeg_part]
+        self._encoded_frame = None
+        self._encode_lock = threading.Lock()
         
         self.frame_count = 0
         self.error_count = 0
@@ -187,26 +215,13 @@ class VideoStream:
                 consecutive_errors = 0
                 self.frame_count += 1
                 
-                # Process frame with detector
-                result = self.detector.process_frame(frame)
-                
-                # Draw results on frame
-                annotated_frame = self.detector.draw_results(frame, result)
-                
-                # Update current frame and result
-                with self.frame_lock:
-                    self.current_frame = annotated_frame
-                    self.current_result = result
-                    self.config.last_frame_time = datetime.now().isoformat()
-                
-                # Send alert callback if unsafe action detected
-                if result.get('alert') and self.alert_callback:
-                    self.last_detection_time = datetime.now()
-                    asyncio.run(self.alert_callback(
-                        self.config.stream_id,
-                        result['action'],
-                        result['confidence']
-                    ))
+                if self.frame_ready is not None:
+                    # Only the newest frame is kept, so a stream the batcher falls behind on drops stale frames
+                    with self.frame_lock:
+                        self._latest_frame = frame
+                    self.frame_ready.set()
+                else:
+                    self.publish(frame, self.detector.process_frame(frame))
                 
                 # Control frame rate
                 time.sleep(1.0 / self.config.fps)
@@ -216,27 +231,133 @@ class VideoStream:
                 logger.error(f"Error processing stream {self.config.stream_id}: {e}")
                 time.sleep(1)
     
-    def get_frame_jpeg(self) -> Optional[bytes]:
-        """Get current frame as JPEG bytes"""
+    def take_latest_frame(self):
+        """Return the newest captured frame not yet processed (None if there is none)"""
         with self.frame_lock:
-            if self.current_frame is None:
-                return None
+            frame, self._latest_frame = self._latest_frame, None
+        return frame
+    
+    def publish(self, frame, result):
+        """Annotate a processed frame, hand it to viewers and raise its alert"""
+        # Draw results on frame
+        annotated_frame = self.detector.draw_results(frame, result)
+        
+        # Update current frame and result
+        with self.frame_lock:
+            self.current_frame = annotated_frame
+            self.current_result = result
+            self.config.last_frame_time = datetime.now().isoformat()
+            self.frame_seq += 1
+            waiters, self._frame_waiters = self._frame_waiters, []
+        self._notify_frame_waiters(waiters)
+        
+        # Send alert callback if unsafe action detected
+        if result.get('alert') and self.alert_callback:
+            self.last_detection_time = datetime.now()
+            self.alert_callback(
+                self.config.stream_id,
+                result['action'],
+                result['confidence']
+            )
+    
+    def _notify_frame_waiters(self, waiters):
+        """Wake viewers blocked in wait_for_frame from the capture thread"""
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # Viewer's event loop already closed
+    
+    async def wait_for_frame(self, last_seq: int, timeout: float = 1.0) -> int:
+        """
+        Wait until a frame newer than last_seq is available
+        
+        Returns the latest frame sequence number (unchanged if the timeout expired first)
+        """
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        with self.frame_lock:
+            if self.frame_seq != last_seq:
+                return self.frame_seq
+            self._frame_waiters.append(waiter)
+        
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            with self.frame_lock:
+                if waiter in self._frame_waiters:
+                    self._frame_waiters.remove(waiter)
+        return self.frame_seq
+    
+    async def jpeg_frames(self, max_fps: Optional[float] = None, multipart: bool = False):
+        """
+        Yield each new annotated frame as JPEG bytes, once, for as long as the stream runs
+        
+        Delivery is paced to at most max_fps (default: the stream's fps) so bursts of
+        frames are coalesced into the newest one instead of flooding slow viewers.
+        With multipart, each frame is yielded as a ready-made MJPEG part instead.
+        Every viewer receives the same shared bytes object, never a per-viewer copy.
+        """
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / (max_fps or self.config.fps or 30)
+        next_deadline = loop.time()
+        last_seq = -1
+        while self.is_running:
+            delay = next_deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            seq = await self.wait_for_frame(last_seq)
+            if seq == last_seq:
+                continue  # Timed out, re-check that the stream is still running
+            last_seq = seq
+            next_deadline = max(next_deadline + interval, loop.time())
             
-            # Encode frame as JPEG
-            ret, buffer = cv2.imencode('.jpg', self.current_frame, 
-                                      [cv2.IMWRITE_JPEG_QUALITY, 85])
-            if not ret:
+            # Another viewer usually encoded this frame already; only go to a thread to encode
+            with self.frame_lock:
+                encoded = self._encoded_frame
+            if encoded is None or encoded[0] != seq:
+                encoded = await asyncio.to_thread(self.get_encoded_frame)
+            if encoded is not None:
+                yield encoded[4] if multipart else encoded[2]
+    
+    def get_encoded_frame(self, with_base64: bool = False) -> Optional[list]:
+        """
+        Get the current frame as [frame_seq, frame_time, jpeg_bytes, base64_or_None, mjpeg_part]
+        
+        Each frame is encoded at most once however many viewers ask for it;
+        the base64 copy is only made once a caller asks for it with with_base64
+        """
+        with self._encode_lock:
+            with self.frame_lock:
+                frame, seq = self.current_frame, self.frame_seq
+                frame_time = self.config.last_frame_time
+                encoded = self._encoded_frame
+            if frame is None:
                 return None
             
-            return buffer.tobytes()
+            if encoded is None or encoded[0] != seq:
+                jpeg_bytes = encode_jpeg(frame)
+                if jpeg_bytes is None:
+                    return None
+                mjpeg_part = b''.join((MJPEG_PART_HEADER % len(jpeg_bytes), jpeg_bytes, b'\r\n'))
+                encoded = [seq, frame_time, jpeg_bytes, None, mjpeg_part]
+                with self.frame_lock:
+                    self._encoded_frame = encoded
+            
+            if with_base64 and encoded[3] is None:
+                encoded[3] = base64.b64encode(encoded[2]).decode('utf-8')
+            return encoded
+    
+    def get_frame_jpeg(self) -> Optional[bytes]:
+        """Get current frame as JPEG bytes"""
+        encoded = self.get_encoded_frame()
+        return encoded[2] if encoded else None
     
     def get_frame_base64(self) -> Optional[str]:
         """Get current frame as base64 encoded string"""
-        jpeg_bytes = self.get_frame_jpeg()
-        if jpeg_bytes is None:
-            return None
-        
-        return base64.b64encode(jpeg_bytes).decode('utf-8')
+        encoded = self.get_encoded_frame(with_base64=True)
+        return encoded[3] if encoded else None
     
     def get_status(self) -> dict:
         """Get stream status and statistics"""
@@ -262,15 +383,71 @@ class StreamManager:
     Manages multiple video streams
     """
     
-    def __init__(self, detector):
+    def __init__(self, detector, alert_loop=None):
         self.detector = detector
         self.streams: Dict[str, VideoStream] = {}
         self.alert_handlers = []
+        
+        # Alert handlers run on this loop so the inference thread never waits on them
+        if alert_loop is None:
+            alert_loop = asyncio.new_event_loop()
+            threading.Thread(target=alert_loop.run_forever, name="stream-alerts", daemon=True).start()
+        self.alert_loop = alert_loop
+        
+        # One inference thread serves every stream: each pass batches the latest frame of all of them
+        self._frame_ready = threading.Event()
+        self._inference_thread = None
+    
+    def _ensure_inference_thread(self):
+        """Start the cross-stream inference thread on first use"""
+        if self._inference_thread is None or not self._inference_thread.is_alive():
+            self._inference_thread = threading.Thread(
+                target=self._inference_loop, name="stream-inference", daemon=True
+            )
+            self._inference_thread.start()
+    
+    def _inference_loop(self):
+        """Run one forward pass over the newest frame of every stream, then scatter the results"""
+        while True:
+            self._frame_ready.wait(timeout=1.0)
+            self._frame_ready.clear()
+            
+            batch = []
+            for stream in list(self.streams.values()):
+                if not stream.is_running:
+                    continue
+                frame = stream.take_latest_frame()
+                if frame is not None:
+                    batch.append((stream, frame))
+            
+            if not batch:
+                continue
+            
+            try:
+                results = self.detector.process_multi_stream(
+                    [(stream.detector, frame) for stream, frame in batch]
+                )
+            except Exception as e:
+                for stream, _ in batch:
+                    stream.error_count += 1
+                logger.error(f"Error running inference for {len(batch)} streams: {e}")
+                continue
+            
+            for (stream, frame), result in zip(batch, results):
+                try:
+                    stream.publish(frame, result)
+                except Exception as e:
+                    stream.error_count += 1
+                    logger.error(f"Error processing stream {stream.config.stream_id}: {e}")
     
     def add_alert_handler(self, handler):
         """Add callback for alerts"""
         self.alert_handlers.append(handler)
     
+    def _dispatch_alert(self, stream_id: str, action: str, confidence: float):
+        """Schedule the alert handlers on the alert loop and return immediately"""
+        asyncio.run_coroutine_threadsafe(self._handle_alert(stream_id, action, confidence), self.alert_loop)
+    
     async def _handle_alert(self, stream_id: str, action: str, confidence: float):
         """Handle alert from stream"""
         for handler in self.alert_handlers:
@@ -286,7 +463,9 @@ class StreamManager:
             return False
         
         # Create and start stream
-        stream = VideoStream(config, self.detector, self._handle_alert)
+        # Each stream gets its own clip buffer and alert state on top of the shared model
+        stream = VideoStream(config, self.detector.fork(), self._dispatch_alert, self._frame_ready)
+        self._ensure_inference_thread()
         success = stream.start()
         
         # Add stream to manager even if it failed (so we can access error info)
@@ -0,0 +1,141 @@
+"""
+Video file decoding for background video processing
+Uses NVDEC hardware decoding via torchcodec when a GPU is available, OpenCV otherwise
+"""
+import os
+import cv2
+import numpy as np
+import torch
+import logging
+
+logger = logging.getLogger(__name__)
+
+# "auto" prefers NVDEC when available, "opencv" forces CPU decoding
+VIDEO_DECODER = os.getenv("VIDEO_DECODER", "auto").lower()
+
+try:
+    from torchcodec.decoders import VideoDecoder
+except ImportError:
+    VideoDecoder = None  # torchcodec not installed, always decode on CPU
+
+
+class OpenCVVideoReader:
+    """
+    CPU decoding through cv2.VideoCapture
+    Frames are BGR numpy arrays of shape (H, W, C)
+    """
+    
+    def __init__(self, video_path: str):
+        self.capture = cv2.VideoCapture(video_path)
+        if not self.capture.isOpened():
+            raise Exception(f"Failed to open video file: {video_path}")
+        
+        self.total_frames = int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30
+        self.width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    
+    def read(self):
+        """Decode the next frame, returns (ret, frame) like cv2.VideoCapture.read"""
+        return self.capture.read()
+    
+    def grab(self) -> bool:
+        """Advance past the next frame without decoding it"""
+        return self.capture.grab()
+    
+    def release(self):
+        """Release the underlying capture"""
+        self.capture.release()
+
+
+class NVDECVideoReader:
+    """
+    GPU decoding through torchcodec (NVDEC)
+    Frames are RGB uint8 CUDA tensors of shape (C, H, W), so they never round-trip through host memory
+    """
+    
+    def __init__(self, video_path: str, chunk_size: int = 16, stride: int = 1):
+        self.decoder = VideoDecoder(video_path, device="cuda")
+        metadata = self.decoder.metadata
+        
+        self.total_frames = metadata.num_frames or len(self.decoder)
+        self.fps = metadata.average_fps or 30
+        self.width = metadata.width
+        self.height = metadata.height
+        
+        # Decode several frames per call to amortize decoder round-trips
+        self.chunk_size = chunk_size
+        # Frames the caller will grab() past are never converted or copied out of the decoder
+        self.stride = max(1, stride)
+        self._chunk = None
+        self._chunk_start = 0
+        self._next_index = 0
+    
+    def read(self):
+        """Decode the next frame, returns (ret, frame) like cv2.VideoCapture.read"""
+        if self._next_index >= self.total_frames:
+            return False, None
+        
+        offset, remainder = divmod(self._next_index - self._chunk_start, self.stride)
+        if self._chunk is None or remainder or offset >= len(self._chunk):
+            stop = min(self._next_index + self.chunk_size * self.stride, self.total_frames)
+            self._chunk = self.decoder.get_frames_in_range(self._next_index, stop, self.stride).data
+            self._chunk_start = self._next_index
+            offset = 0
+        
+        frame = self._chunk[offset]
+        self._next_index += 1
+        return True, frame
+    
+    def grab(self) -> bool:
+        """Advance past the next frame without decoding it"""
+        if self._next_index >= self.total_frames:
+            return False
+        self._next_index += 1
+        return True
+    
+    def release(self):
+        """Drop decoder state and any buffered GPU frames"""
+        self._chunk = None
+        self.decoder = None
+
+
+def frame_difference(frame, reference, step: int = 8) -> float:
+    """
+    Mean absolute pixel difference between two frames, sampled on a coarse grid
+    
+    Args:
+        frame: Frame from either reader (BGR numpy HWC or RGB CUDA tensor CHW)
+        reference: Frame of the same kind to compare against
+        step: Sampling step along height and width
+    
+    Returns:
+        Mean absolute difference in 0-255 pixel units
+    """
+    if isinstance(frame, torch.Tensor):
+        current = frame[:, ::step, ::step].float()
+        previous = reference[:, ::step, ::step].float()
+        return (current - previous).abs().mean().item()
+    
+    current = frame[::step, ::step].astype(np.int16)
+    return float(np.abs(current - reference[::step, ::step]).mean())
+
+
+def open_video_reader(video_path: str, stride: int = 1):
+    """
+    Open a video file for sequential decoding
+    
+    Args:
+        video_path: Path to the video file
+        stride: Expected read() spacing; NVDEC only materializes every `stride`-th frame
+    
+    Returns:
+        Reader exposing read()/grab()/release() plus total_frames, fps, width and height
+    """
+    if VIDEO_DECODER != "opencv" and VideoDecoder is not None and torch.cuda.is_available():
+        try:
+            return NVDECVideoReader(video_path, stride=stride)
+        except Exception as e:
+            logger.warning(f"NVDEC decoding unavailable for {video_path}, falling back to OpenCV: {e}")
+    
+    return OpenCVVideoReader(video_path)
@@ -10,7 +10,7 @@ def check_python_packages():
     print("[*] Checking Python packages...")
     required_packages = [
         'fastapi', 'uvicorn', 'torch', 'torchvision', 'cv2', 
-        'yaml', 'sqlalchemy', 'jwt', 'passlib', 'aiosmtplib'
+        'yaml', 'sqlalchemy', 'jwt', 'aiosmtplib'
     ]
     
     missing = []
@@ -5,6 +5,7 @@ import os
 import json
 import cv2
 import torch
+import torch.nn.functional as F
 import numpy as np
 from torch.utils.data import Dataset, DataLoader, ConcatDataset, random_split
 from torchvision import transforms
@@ -458,25 +459,36 @@ class StreamVideoBuffer:
     Maintains a sliding window of frames for temporal analysis
     """
     
+    MEAN = [0.485, 0.456, 0.406]
+    STD = [0.229, 0.224, 0.225]
+    
     def __init__(self, buffer_size=32, num_frames=16, frame_interval=2):
         self.buffer_size = buffer_size
         self.num_frames = num_frames
         self.frame_interval = frame_interval
         self.buffer = []
+        self.processed = []  # Model-ready (C, H, W) tensors, aligned with self.buffer
         
         self.transform = transforms.Compose([
             transforms.ToPILImage(),
             transforms.Resize((224, 224)),
             transforms.ToTensor(),
-            transforms.Normalize(mean=[0.485, 0.456, 0.406], 
-                               std=[0.229, 0.224, 0.225])
+            transforms.Normalize(mean=self.MEAN, std=self.STD)
         ])
     
-    def add_frame(self, frame):
-        """Add a new frame to the buffer"""
+    def add_frame(self, frame, processed=None):
+        """
+        Add a new frame to the buffer, preprocessing it once for every clip it will appear in
+        
+        Args:
+            frame: BGR numpy frame or RGB tensor frame
+            processed: Output of preprocess(frame) if it was already computed (e.g. on a decode thread)
+        """
         self.buffer.append(frame)
+        self.processed.append(processed if processed is not None else self.preprocess(frame))
         if len(self.buffer) > self.buffer_size:
             self.buffer.pop(0)
+            self.processed.pop(0)
     
     def get_clip(self):
         """Get a clip of frames for model inference"""
@@ -485,22 +497,41 @@ class StreamVideoBuffer:
         
         # Sample frames from buffer
         indices = np.linspace(0, len(self.buffer) - 1, self.num_frames).astype(int)
-        frames = [self.buffer[i] for i in indices]
-        
-        # Process frames
-        processed_frames = []
-        for frame in frames:
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_tensor = self.transform(frame_rgb)
-            processed_frames.append(frame_tensor)
         
         # Stack: (T, C, H, W)
-        clip_tensor = torch.stack(processed_frames)
+        clip_tensor = torch.stack([self.processed[i] for i in indices])
         return clip_tensor.unsqueeze(0)  # Add batch dimension: (1, T, C, H, W)
     
+    def preprocess(self, frame):
+        """Resize and normalize a single BGR numpy frame or RGB tensor frame to (C, 224, 224) (thread-safe)"""
+        # Frames decoded on the GPU are preprocessed where they already live
+        if isinstance(frame, torch.Tensor):
+            return self._process_tensor_frames([frame])[0]
+        
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return self.transform(frame_rgb)
+    
+    def _process_tensor_frames(self, frames):
+        """
+        Resize and normalize RGB uint8 tensor frames on their own device
+        
+        Args:
+            frames: List of tensors of shape (C, H, W)
+        
+        Returns:
+            clip_tensor: Tensor of shape (T, C, 224, 224)
+        """
+        clip = torch.stack(frames).float().div_(255)
+        clip = F.interpolate(clip, size=(224, 224), mode='bilinear', align_corners=False, antialias=True)
+        
+        mean = torch.tensor(self.MEAN, device=clip.device).view(1, 3, 1, 1)
+        std = torch.tensor(self.STD, device=clip.device).view(1, 3, 1, 1)
+        return (clip - mean) / std
+    
     def clear(self):
         """Clear the buffer"""
         self.buffer = []
+        self.processed = []
 
 
 def create_dataloaders(config):
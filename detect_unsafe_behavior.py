@@ -169,7 +169,7 @@ class SafetyDetector:
         # Add batch dimension: (1, T, C, H, W)
         return video_tensor.unsqueeze(0)
     
-    @torch.no_grad()
+    @torch.inference_mode()
     def predict(self, video_path: str, start_frame: int = 0, end_frame: int = None):
         """
         Predict unsafe behavior in a video or video segment.
@@ -67,7 +67,7 @@ def evaluate(config, model_path, split='test'):
     all_labels = []
     all_probs = []
     
-    with torch.no_grad():
+    with torch.inference_mode():
         for videos, labels in tqdm(dataloader, desc='Evaluating'):
             videos = videos.to(device)
             labels = labels.to(device)
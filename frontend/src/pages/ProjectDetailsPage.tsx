@@ -311,6 +311,11 @@ export default function ProjectDetailsPage() {
                     </div>
                   </div>
                 ))}
+                {project.has_more && (
+                  <p className="text-sm text-gray-500 text-center pt-2">
+                    Showing the {project.videos.length} most recent of {project.stats?.total_videos} videos
+                  </p>
+                )}
               </div>
             ) : (
               <div className="text-center py-8">
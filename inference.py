@@ -3,11 +3,14 @@ Real-time inference system for detecting unsafe actions in video streams
 with alert notifications
 """
 import os
+import copy
+import contextlib
 import cv2
 import torch
 import yaml
 import time
 import json
+import threading
 import numpy as np
 from datetime import datetime
 from pathlib import Path
@@ -51,6 +54,20 @@ class UnsafeActionDetector:
         # Load model (may override action_classes from checkpoint's label_mapping)
         self.model = self.load_model(model_path)
         self.model.eval()
+        self.input_dtype = torch.float32
+        self.amp_dtype = torch.float16  # Autocast dtype for eager CUDA forward passes
+        
+        # CUDA graph of the batched forward pass (captured by optimize_for_inference)
+        self._cuda_graph = None
+        self._graph_input = None
+        self._graph_output = None
+        self._graph_lock = threading.Lock()
+        
+        # Each detector (and fork) issues its GPU work on its own stream so concurrent jobs don't serialize
+        self._stream = torch.cuda.Stream(self.device) if self.device.type == 'cuda' else None
+        
+        # Optional backend.batcher.ClipBatcher shared by this detector's forks, merging their forward passes
+        self.clip_batcher = None
         
         # Inference settings
         self.confidence_threshold = config['inference']['confidence_threshold']
@@ -88,6 +105,10 @@ class UnsafeActionDetector:
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Model checkpoint not found: {model_path}")
         
+        # INT8 TorchScript artifacts from quantize_model.py run on CPU quantized kernels
+        if model_path.endswith('.pt'):
+            return self._load_quantized_model(model_path)
+        
         # Load checkpoint first to get the config it was trained with
         checkpoint = torch.load(model_path, map_location=self.device, weights_only=False)
         
@@ -120,6 +141,123 @@ class UnsafeActionDetector:
         self.logger.info(f"Loaded model from: {model_path}")
         return model
     
+    def _load_quantized_model(self, model_path):
+        """Load an INT8 TorchScript model and the label mapping embedded with it"""
+        self.device = torch.device('cpu')
+        extra_files = {'label_mapping.json': ''}
+        model = torch.jit.load(model_path, map_location='cpu', _extra_files=extra_files)
+        
+        label_mapping = json.loads(extra_files['label_mapping.json'] or '{}')
+        if label_mapping:
+            sorted_labels = sorted(label_mapping.items(), key=lambda x: x[1])
+            self.action_classes = [label for label, _ in sorted_labels]
+            self.logger.info(f"Loaded {len(self.action_classes)} action classes from quantized model")
+        
+        self.logger.info(f"Loaded INT8 quantized model from: {model_path}")
+        return model
+    
+    def optimize_for_inference(self):
+        """
+        Cast the model to FP16 (or BF16), compile it with torch.compile and capture a CUDA graph when running on CUDA
+        Half precision halves memory traffic and uses tensor cores; compiling fuses kernels, and replaying
+        the captured graph removes the per-batch kernel launch overhead
+        """
+        if self.device.type != 'cuda':
+            return
+        
+        # BF16 keeps FP32's exponent range (no overflow in large activations); it needs Ampere or newer
+        precision = self.config['inference'].get('precision', 'float16')
+        if precision == 'bfloat16' and torch.cuda.is_bf16_supported():
+            self.input_dtype = torch.bfloat16
+        else:
+            self.input_dtype = torch.float16
+        self.amp_dtype = self.input_dtype
+        self.model = self.model.to(self.input_dtype).eval()
+        
+        # NHWC weights make cuDNN pick tensor-core kernels for the per-frame 2D backbone
+        # (its (B*T, C, H, W) activations follow the weight layout; 3D conv models have no 2D backbone)
+        backbone = getattr(self.model, 'backbone', None)
+        if backbone is not None:
+            backbone.to(memory_format=torch.channels_last)
+        
+        # COMPILE_MODEL=0 falls back to eager mode (e.g. when recompiles dominate on a new model)
+        if hasattr(torch, 'compile') and os.getenv("COMPILE_MODEL", "1") == "1":
+            self.model = torch.compile(self.model)
+            self.logger.info(f"Detector model cast to {self.input_dtype} and compiled with torch.compile")
+        
+        batch_size = self.config['inference'].get('batch_size', 16)
+        try:
+            self._capture_cuda_graph(batch_size)
+            self.logger.info(f"Captured CUDA graph for batches of {batch_size} clips")
+        except Exception as e:
+            self._cuda_graph = None
+            self.logger.warning(f"CUDA graph capture failed, using eager forward passes: {e}")
+    
+    def warmup(self):
+        """
+        Run a dummy forward pass of the inference input shape
+        Forces lazy CUDA context/kernel initialisation and cuDNN autotuning before real traffic arrives
+        """
+        num_frames = self.config['model']['num_frames']
+        dummy_clip = torch.zeros((1, num_frames, 3, 224, 224))
+        self.predict(dummy_clip)
+        if self.device.type == 'cuda':
+            torch.cuda.synchronize()
+    
+    def _capture_cuda_graph(self, batch_size):
+        """
+        Warm up and record the forward pass for a fixed (B, T, C, H, W) input
+        
+        Args:
+            batch_size: Number of clips per replay, smaller batches are padded up to it
+        """
+        num_frames = self.config['model']['num_frames']
+        static_input = torch.zeros(
+            (batch_size, num_frames, 3, 224, 224), device=self.device, dtype=self.input_dtype
+        )
+        
+        # Warm up on a side stream so compilation and cuDNN autotuning happen before capture
+        side_stream = torch.cuda.Stream()
+        side_stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(side_stream), torch.inference_mode():
+            for _ in range(3):
+                self.model(static_input)
+        torch.cuda.current_stream().wait_stream(side_stream)
+        
+        graph = torch.cuda.CUDAGraph()
+        with torch.inference_mode(), torch.cuda.graph(graph):
+            static_output = self.model(static_input)
+        
+        self._graph_input = static_input
+        self._graph_output = static_output
+        self._cuda_graph = graph
+    
+    def fork(self):
+        """
+        Create a detector that shares this one's loaded model but has its own clip buffer,
+        prediction smoothing and alert cooldown state, so concurrent videos/streams don't mix frames
+        """
+        clone = copy.copy(self)
+        clone.video_buffer = StreamVideoBuffer(
+            buffer_size=self.config['inference']['video_buffer_size'],
+            num_frames=self.config['model']['num_frames'],
+            frame_interval=self.config['model']['frame_interval']
+        )
+        if self.temporal_smoothing:
+            clone.prediction_buffer = deque(maxlen=self.smoothing_window)
+        clone.last_alert_times = {}
+        if self._stream is not None:
+            clone._stream = torch.cuda.Stream(self.device)
+        return clone
+    
+    def _inference_stream(self):
+        """Context that runs GPU work on this detector's stream (no-op on CPU)"""
+        if self._stream is None:
+            return contextlib.nullcontext()
+        # Inputs may have been produced on the default stream (e.g. NVDEC frames)
+        self._stream.wait_stream(torch.cuda.current_stream(self.device))
+        return torch.cuda.stream(self._stream)
+    
     def setup_alerts(self):
         """Setup alert notification system"""
         if self.alert_config['enabled']:
@@ -143,10 +281,10 @@ class UnsafeActionDetector:
             action_class: Predicted action class
             confidence: Confidence score
         """
-        with torch.no_grad():
-            video_clip = video_clip.to(self.device)
+        with self._inference_stream(), torch.inference_mode():
+            video_clip = video_clip.to(self.device, dtype=self.input_dtype)
             outputs = self.model(video_clip)
-            probabilities = torch.softmax(outputs, dim=1)
+            probabilities = torch.softmax(outputs.float(), dim=1)
             confidence, predicted = torch.max(probabilities, dim=1)
             
             action_class = predicted.item()
@@ -154,6 +292,49 @@ class UnsafeActionDetector:
         
         return action_class, confidence_score
     
+    def predict_batch(self, video_clips):
+        """
+        Make predictions on a batch of video clips with a single forward pass
+        
+        Args:
+            video_clips: Tensor of shape (B, T, C, H, W)
+        
+        Returns:
+            predictions: List of (action_class, confidence) tuples, one per clip
+        """
+        with self._inference_stream():
+            if self._cuda_graph is not None:
+                outputs = self._replay_cuda_graph(video_clips)
+            else:
+                use_amp = self.device.type == 'cuda'
+                with torch.inference_mode(), torch.autocast(device_type=self.device.type, dtype=self.amp_dtype, enabled=use_amp):
+                    video_clips = video_clips.to(self.device, dtype=self.input_dtype, non_blocking=True)
+                    outputs = self.model(video_clips)
+            
+            # Softmax in FP32 so confidence thresholds behave the same as the single-clip path
+            probabilities = torch.softmax(outputs.float(), dim=1)
+            confidences, predicted = torch.max(probabilities, dim=1)
+            
+            # tolist() synchronizes this detector's stream before the results are read
+            return list(zip(predicted.tolist(), confidences.tolist()))
+    
+    def _replay_cuda_graph(self, video_clips):
+        """Run (B, T, C, H, W) clips through the captured graph in chunks of its static batch size"""
+        graph_batch = self._graph_input.shape[0]
+        outputs = []
+        
+        # The static buffers are shared, so replays from concurrent workers must not interleave
+        with self._graph_lock, torch.inference_mode():
+            for start in range(0, video_clips.shape[0], graph_batch):
+                chunk = video_clips[start:start + graph_batch]
+                self._graph_input[:len(chunk)].copy_(chunk, non_blocking=True)
+                self._cuda_graph.replay()
+                outputs.append(self._graph_output[:len(chunk)].clone())
+            # Other detectors' streams may reuse the static buffers as soon as the lock is released
+            torch.cuda.current_stream(self.device).synchronize()
+        
+        return torch.cat(outputs)
+    
     def smooth_predictions(self, action_class, confidence):
         """
         Apply temporal smoothing to predictions
@@ -292,6 +473,10 @@ class UnsafeActionDetector:
         
         # Save video
         if frames:
+            # GPU-decoded frames are RGB (C, H, W) tensors; the writer expects BGR arrays
+            if isinstance(frames[0], torch.Tensor):
+                frames = [frame.permute(1, 2, 0).flip(-1).cpu().numpy() for frame in frames]
+            
             height, width = frames[0].shape[:2]
             fourcc = cv2.VideoWriter_fourcc(*'mp4v')
             fps = self.config['inference']['fps']
@@ -348,16 +533,116 @@ class UnsafeActionDetector:
         
         if video_clip is None:
             # Not enough frames yet
-            return {
-                'action': 'initializing',
-                'confidence': 0.0,
-                'alert': False,
-                'severity': 0
-            }
+            return self._initializing_result()
         
         # Make prediction
         action_class, confidence = self.predict(video_clip)
         
+        return self._build_result(frame, action_class, confidence, self.video_buffer.buffer)
+    
+    def process_batch(self, frames, processed_frames=None):
+        """
+        Process consecutive frames from a video with one batched forward pass
+        
+        Args:
+            frames: List of video frames (BGR format) in playback order
+            processed_frames: Optional video_buffer.preprocess() output for each frame, computed ahead of time
+        
+        Returns:
+            results: List of detection result dictionaries, one per frame
+        """
+        results = [None] * len(frames)
+        clips = []
+        pending = []  # (frame index, buffer snapshot) for frames that produced a clip
+        
+        for i, frame in enumerate(frames):
+            self.video_buffer.add_frame(frame, processed_frames[i] if processed_frames else None)
+            video_clip = self.video_buffer.get_clip()
+            
+            if video_clip is None:
+                results[i] = self._initializing_result()
+                continue
+            
+            clips.append(video_clip)
+            pending.append((i, list(self.video_buffer.buffer)))
+        
+        if clips:
+            predictions = self._predict_clips(clips)
+            for (i, buffer_snapshot), (action_class, confidence) in zip(pending, predictions):
+                results[i] = self._build_result(frames[i], action_class, confidence, buffer_snapshot)
+        
+        return results
+    
+    def process_multi_stream(self, items):
+        """
+        Process the latest frame of several streams with one batched forward pass
+        
+        Args:
+            items: List of (detector, frame) pairs, where each detector is a fork() of this one
+                   holding one stream's clip buffer and alert state
+        
+        Returns:
+            results: List of detection result dictionaries, one per pair
+        """
+        results = [None] * len(items)
+        clips = []
+        pending = []  # (item index, buffer snapshot) for streams whose buffer produced a clip
+        
+        for i, (stream_detector, frame) in enumerate(items):
+            stream_detector.video_buffer.add_frame(frame)
+            video_clip = stream_detector.video_buffer.get_clip()
+            
+            if video_clip is None:
+                results[i] = stream_detector._initializing_result()
+                continue
+            
+            clips.append(video_clip)
+            pending.append((i, list(stream_detector.video_buffer.buffer)))
+        
+        if clips:
+            predictions = self._predict_clips(clips)
+            for (i, buffer_snapshot), (action_class, confidence) in zip(pending, predictions):
+                stream_detector, frame = items[i]
+                results[i] = stream_detector._build_result(frame, action_class, confidence, buffer_snapshot)
+        
+        return results
+    
+    def _predict_clips(self, clips):
+        """Predict a list of (1, T, C, H, W) clips, through the shared clip batcher when one is attached"""
+        if self.clip_batcher is not None:
+            return self.clip_batcher.predict(self, clips)
+        return self.forward_clips(clips)
+    
+    def forward_clips(self, clips):
+        """Run a list of (1, T, C, H, W) clips through predict_batch as one batch"""
+        batch = torch.cat(clips)
+        # Page-locked staging lets the non_blocking host-to-device copy actually run asynchronously
+        if self.device.type == 'cuda' and not batch.is_cuda:
+            batch = batch.pin_memory()
+        return self.predict_batch(batch)
+    
+    def _initializing_result(self):
+        """Result returned while the buffer does not yet hold a full clip"""
+        return {
+            'action': 'initializing',
+            'confidence': 0.0,
+            'alert': False,
+            'severity': 0
+        }
+    
+    def _build_result(self, frame, action_class, confidence, buffer_frames):
+        """
+        Apply smoothing, severity filtering and alerting to a raw prediction
+        
+        Args:
+            frame: Frame the prediction belongs to
+            action_class: Predicted action class
+            confidence: Confidence score
+            buffer_frames: Buffered frames leading up to this frame (used for alert clips)
+        
+        Returns:
+            result: Dictionary with detection results
+        """
         # Apply temporal smoothing
         action_class, confidence = self.smooth_predictions(action_class, confidence)
         
@@ -388,7 +673,7 @@ class UnsafeActionDetector:
             # Save video clip
             if self.alert_config['save_clips']:
                 video_clip_path = self.save_alert_clip(
-                    self.video_buffer.buffer, 
+                    buffer_frames, 
                     action_class, 
                     confidence
                 )
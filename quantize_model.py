@@ -0,0 +1,132 @@
+"""
+Post-training INT8 quantization of the unsafe action detection model
+Produces a TorchScript artifact for fast CPU inference (x86 VNNI / fbgemm kernels)
+"""
+import os
+import json
+import yaml
+import torch
+import argparse
+from tqdm import tqdm
+
+from torch.ao.quantization import get_default_qconfig_mapping
+from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+from models.action_detector import create_model
+from data.dataset import create_dataloaders
+from utils.logger import setup_logger
+
+
+def load_float_model(config, model_path):
+    """
+    Load a trained FP32 checkpoint on CPU
+
+    Args:
+        config: Configuration dictionary (overridden by the checkpoint's own config if present)
+        model_path: Path to model checkpoint
+
+    Returns:
+        model: FP32 model in eval mode
+        label_mapping: Label -> index mapping stored in the checkpoint (or None)
+    """
+    checkpoint = torch.load(model_path, map_location='cpu', weights_only=False)
+    model_config = checkpoint.get('config') or config
+
+    model = create_model(model_config)
+    model.load_state_dict(checkpoint['model_state_dict'])
+    model.eval()
+
+    return model, checkpoint.get('label_mapping')
+
+
+def quantize_model(model, calibration_clips, backend='x86'):
+    """
+    Statically quantize the model's 2D frame backbone to INT8
+
+    The backbone does nearly all of the compute; the temporal head is small and stays in FP32
+
+    Args:
+        model: FP32 model with a `backbone` module (video_action_detector or lstm architectures)
+        calibration_clips: Iterable of (B, T, C, H, W) tensors used to observe activation ranges
+        backend: Quantized engine ('x86', 'fbgemm' or 'qnnpack')
+
+    Returns:
+        model: Model whose backbone runs INT8 kernels
+    """
+    if not hasattr(model, 'backbone'):
+        raise ValueError("INT8 quantization requires a model with a 2D CNN backbone (not c3d)")
+
+    torch.backends.quantized.engine = backend
+    qconfig_mapping = get_default_qconfig_mapping(backend)
+
+    example_frames = torch.randn(1, 3, 224, 224)
+    model.backbone = prepare_fx(model.backbone, qconfig_mapping, (example_frames,))
+
+    # Calibration: run full clips so the backbone sees real (B*T, C, H, W) frame batches
+    with torch.inference_mode():
+        for clip in tqdm(calibration_clips, desc='Calibrating'):
+            model(clip)
+
+    model.backbone = convert_fx(model.backbone)
+    return model
+
+
+def export_torchscript(model, output_path, num_frames, label_mapping=None):
+    """
+    Trace the quantized model and save it with its label mapping
+
+    Args:
+        model: Quantized model
+        output_path: Where to write the TorchScript file
+        num_frames: Frames per clip the model expects
+        label_mapping: Label -> index mapping to embed (read back by UnsafeActionDetector)
+    """
+    example_clip = torch.randn(1, num_frames, 3, 224, 224)
+    with torch.inference_mode():
+        scripted = torch.jit.freeze(torch.jit.trace(model, example_clip))
+
+    extra_files = {'label_mapping.json': json.dumps(label_mapping or {})}
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    torch.jit.save(scripted, output_path, _extra_files=extra_files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Quantize unsafe action detection model to INT8')
+    parser.add_argument('--config', type=str, default='config.yaml',
+                       help='Path to configuration file')
+    parser.add_argument('--model', type=str, default='checkpoints/best_model.pth',
+                       help='Path to FP32 model checkpoint')
+    parser.add_argument('--output', type=str, default='checkpoints/best_model_int8.pt',
+                       help='Path for the INT8 TorchScript model')
+    parser.add_argument('--calibration-batches', type=int, default=32,
+                       help='Validation batches used to calibrate activation ranges')
+    parser.add_argument('--backend', type=str, default='x86',
+                       choices=['x86', 'fbgemm', 'qnnpack'],
+                       help='Quantized engine to target')
+
+    args = parser.parse_args()
+
+    # Load config
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+
+    logger = setup_logger(config['logging']['save_dir'])
+
+    model, label_mapping = load_float_model(config, args.model)
+    logger.info(f"Loaded FP32 model from: {args.model}")
+
+    # Calibrate on held-out validation clips
+    _, val_loader = create_dataloaders(config)
+    calibration_clips = []
+    for i, (clips, _) in enumerate(val_loader):
+        if i >= args.calibration_batches:
+            break
+        calibration_clips.append(clips)
+
+    model = quantize_model(model, calibration_clips, args.backend)
+    export_torchscript(model, args.output, config['model']['num_frames'], label_mapping)
+    logger.info(f"INT8 model saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
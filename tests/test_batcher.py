@@ -0,0 +1,137 @@
+"""
+Tests for ClipBatcher request coalescing
+"""
+import threading
+import time
+
+import pytest
+
+from backend.batcher import ClipBatcher
+
+
+class FakeDetector:
+    """Stands in for UnsafeActionDetector: records each forward pass and echoes clips back"""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    def forward_clips(self, clips):
+        self.calls.append(list(clips))
+        if self.error is not None:
+            raise self.error
+        return [(clip, 1.0) for clip in clips]
+
+
+def run_concurrently(batcher, detector, requests):
+    """Submit each request from its own thread at the same time, returns {index: result or exception}"""
+    results = {}
+    barrier = threading.Barrier(len(requests))
+
+    def worker(index, clips):
+        barrier.wait()
+        try:
+            results[index] = batcher.predict(detector, clips)
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i, clips)) for i, clips in enumerate(requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert not any(thread.is_alive() for thread in threads)
+    return results
+
+
+def test_concurrent_callers_share_one_forward_pass():
+    detector = FakeDetector()
+    requests = [[f"clip{i}a", f"clip{i}b"] for i in range(4)]
+    # A long wait and a batch that fits exactly: the leader runs once all callers are queued
+    batcher = ClipBatcher(max_batch=8, max_wait_ms=5000)
+
+    results = run_concurrently(batcher, detector, requests)
+
+    assert len(detector.calls) == 1
+    assert sorted(detector.calls[0]) == sorted(clip for clips in requests for clip in clips)
+    for i, clips in enumerate(requests):
+        assert results[i] == [(clip, 1.0) for clip in clips]
+
+
+def test_single_caller_runs_after_max_wait():
+    detector = FakeDetector()
+    batcher = ClipBatcher(max_batch=32, max_wait_ms=50)
+
+    start = time.monotonic()
+    result = batcher.predict(detector, ["only"])
+    elapsed = time.monotonic() - start
+
+    assert result == [("only", 1.0)]
+    assert detector.calls == [["only"]]
+    assert 0.04 <= elapsed < 2.0
+
+
+def test_full_batch_does_not_wait():
+    batcher = ClipBatcher(max_batch=2, max_wait_ms=5000)
+
+    start = time.monotonic()
+    result = batcher.predict(FakeDetector(), ["a", "b"])
+
+    assert result == [("a", 1.0), ("b", 1.0)]
+    assert time.monotonic() - start < 1.0
+
+
+def test_oversize_request_splits_into_groups_in_order():
+    detector = FakeDetector()
+    requests = [["a1", "a2", "a3"], ["b1", "b2", "b3"]]
+    batcher = ClipBatcher(max_batch=4, max_wait_ms=200)
+
+    results = run_concurrently(batcher, detector, requests)
+
+    # Two requests of 3 never fit one batch of 4, so each gets its own pass
+    assert sorted(len(call) for call in detector.calls) == [3, 3]
+    assert results[0] == [(clip, 1.0) for clip in requests[0]]
+    assert results[1] == [(clip, 1.0) for clip in requests[1]]
+
+
+def test_exception_reaches_every_waiter():
+    detector = FakeDetector(error=RuntimeError("CUDA out of memory"))
+    batcher = ClipBatcher(max_batch=3, max_wait_ms=5000)
+
+    results = run_concurrently(batcher, detector, [["a"], ["b"], ["c"]])
+
+    assert len(detector.calls) == 1
+    for i in range(3):
+        assert isinstance(results[i], RuntimeError)
+        assert str(results[i]) == "CUDA out of memory"
+
+
+def test_batcher_recovers_after_failed_pass():
+    detector = FakeDetector(error=ValueError("bad clip"))
+    batcher = ClipBatcher(max_batch=1, max_wait_ms=0)
+
+    with pytest.raises(ValueError):
+        batcher.predict(detector, ["x"])
+
+    detector.error = None
+    assert batcher.predict(detector, ["y"]) == [("y", 1.0)]
+
+
+def test_gate_is_held_around_each_forward_pass():
+    held = []
+
+    class Gate:
+        def __enter__(self):
+            held.append(True)
+
+        def __exit__(self, *exc):
+            held.append(False)
+
+    detector = FakeDetector()
+    original = detector.forward_clips
+    detector.forward_clips = lambda clips: (held.append("forward"), original(clips))[1]
+    batcher = ClipBatcher(max_batch=1, max_wait_ms=0, gate=Gate())
+
+    batcher.predict(detector, ["x"])
+
+    assert held == [True, "forward", False]
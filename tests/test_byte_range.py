@@ -0,0 +1,92 @@
+"""
+Tests for HTTP Range handling on video downloads and playback
+"""
+import pytest
+
+# backend.app pulls in the full inference stack
+app_module = pytest.importorskip("backend.app")
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+FILE_SIZE = 10000
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", (0, 9)),
+    ("bytes=10-", (10, FILE_SIZE - 1)),           # open-ended
+    ("bytes=-5", (FILE_SIZE - 5, FILE_SIZE - 1)),  # suffix
+    ("bytes=-20000", (0, FILE_SIZE - 1)),          # suffix longer than the file
+    ("bytes=9990-20000", (9990, FILE_SIZE - 1)),   # end clamped to the file
+    (" bytes = 5-6", (5, 6)),
+])
+def test_satisfiable_ranges(header, expected):
+    assert app_module._parse_byte_range(header, FILE_SIZE) == expected
+
+
+@pytest.mark.parametrize("header", [
+    "bytes=10000-",      # starts past the end
+    "bytes=99999999-",
+    "bytes=5-2",         # end before start
+    "bytes=-0",          # empty suffix
+    "bytes=0-1,5-6",     # multiple ranges are not supported
+    "items=0-9",         # unknown unit
+    "bytes=abc-",
+    "bytes=-",
+])
+def test_unsatisfiable_ranges(header):
+    assert app_module._parse_byte_range(header, FILE_SIZE) is None
+
+
+def test_empty_file_has_no_satisfiable_range():
+    assert app_module._parse_byte_range("bytes=0-", 0) is None
+
+
+@pytest.fixture
+def client(tmp_path):
+    data = bytes(range(256)) * 40  # 10240 bytes
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(data)
+
+    api = FastAPI()
+
+    @api.get("/video")
+    def video(request: Request):
+        return app_module._ranged_file_response(path, request.headers.get("range"), "video/mp4", "clip.mp4")
+
+    return TestClient(api), data
+
+
+def test_full_response_advertises_ranges(client):
+    test_client, data = client
+    response = test_client.get("/video")
+
+    assert response.status_code == 200
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.content == data
+
+
+def test_partial_response(client):
+    test_client, data = client
+    response = test_client.get("/video", headers={"Range": "bytes=100-"})
+
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 100-{len(data) - 1}/{len(data)}"
+    assert response.headers["content-length"] == str(len(data) - 100)
+    assert response.content == data[100:]
+
+
+def test_suffix_response(client):
+    test_client, data = client
+    response = test_client.get("/video", headers={"Range": "bytes=-10"})
+
+    assert response.status_code == 206
+    assert response.content == data[-10:]
+
+
+def test_unsatisfiable_response(client):
+    test_client, data = client
+    response = test_client.get("/video", headers={"Range": f"bytes={len(data)}-"})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(data)}"
@@ -0,0 +1,167 @@
+"""
+Tests for video file decoding and strided frame access
+"""
+import cv2
+import numpy as np
+import pytest
+import torch
+
+from backend import video_decoder
+from backend.video_decoder import NVDECVideoReader, OpenCVVideoReader, frame_difference, open_video_reader
+
+NUM_FRAMES = 12
+
+
+def read_strided(reader, stride):
+    """Read every `stride`-th frame and grab() past the rest, as run_video_processing does"""
+    frames = []
+    index = 0
+    while True:
+        if index % stride:
+            if not reader.grab():
+                break
+        else:
+            ret, frame = reader.read()
+            if not ret:
+                break
+            frames.append(frame)
+        index += 1
+    return frames
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    """Short MJPEG video whose frame i is a flat image of brightness 20 * i"""
+    path = str(tmp_path / "frames.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for i in range(NUM_FRAMES):
+        writer.write(np.full((48, 64, 3), 20 * i, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def brightness(frame):
+    return int(round(float(frame.mean()) / 20))
+
+
+def test_opencv_reader_metadata(video_path):
+    reader = OpenCVVideoReader(video_path)
+    try:
+        assert reader.total_frames == NUM_FRAMES
+        assert reader.fps == pytest.approx(10)
+        assert (reader.width, reader.height) == (64, 48)
+    finally:
+        reader.release()
+
+
+@pytest.mark.parametrize("stride", [1, 2, 3, 5])
+def test_opencv_reader_stride(video_path, stride):
+    reader = OpenCVVideoReader(video_path)
+    try:
+        frames = read_strided(reader, stride)
+    finally:
+        reader.release()
+
+    assert [brightness(frame) for frame in frames] == list(range(0, NUM_FRAMES, stride))
+
+
+def test_opencv_reader_rejects_missing_file(tmp_path):
+    with pytest.raises(Exception):
+        OpenCVVideoReader(str(tmp_path / "missing.mp4"))
+
+
+def test_open_video_reader_falls_back_to_opencv(video_path, monkeypatch):
+    monkeypatch.setattr(video_decoder, "VIDEO_DECODER", "opencv")
+    reader = open_video_reader(video_path, stride=3)
+    try:
+        assert isinstance(reader, OpenCVVideoReader)
+    finally:
+        reader.release()
+
+
+class FakeDecoder:
+    """torchcodec VideoDecoder stand-in on CPU: frame i is a (3, 4, 4) tensor filled with i"""
+
+    def __init__(self, path, device=None):
+        self.metadata = type("Metadata", (), {
+            "num_frames": NUM_FRAMES, "average_fps": 25.0, "width": 4, "height": 4
+        })()
+        self.requests = []
+
+    def __len__(self):
+        return NUM_FRAMES
+
+    def get_frames_in_range(self, start, stop, step=1):
+        self.requests.append((start, stop, step))
+        indices = range(start, stop, step)
+        data = torch.stack([torch.full((3, 4, 4), i, dtype=torch.uint8) for i in indices])
+        return type("FrameBatch", (), {"data": data})()
+
+
+@pytest.fixture
+def fake_nvdec(monkeypatch):
+    monkeypatch.setattr(video_decoder, "VideoDecoder", FakeDecoder)
+
+
+@pytest.mark.parametrize("stride", [1, 2, 3, 5])
+def test_nvdec_reader_stride(fake_nvdec, stride):
+    reader = NVDECVideoReader("video.mp4", chunk_size=2, stride=stride)
+
+    frames = read_strided(reader, stride)
+
+    assert [int(frame[0, 0, 0]) for frame in frames] == list(range(0, NUM_FRAMES, stride))
+    # Only the frames that are read are ever decoded, a chunk at a time
+    for start, stop, step in reader.decoder.requests:
+        assert step == stride
+        assert len(range(start, stop, step)) <= 2
+
+
+def test_nvdec_reader_handles_unexpected_read(fake_nvdec):
+    # A read() off the stride (e.g. motion-gated decoding) still returns the right frame
+    reader = NVDECVideoReader("video.mp4", chunk_size=4, stride=3)
+
+    assert int(reader.read()[1][0, 0, 0]) == 0
+    assert int(reader.read()[1][0, 0, 0]) == 1
+    assert reader.grab()
+    assert int(reader.read()[1][0, 0, 0]) == 3
+
+
+def test_nvdec_reader_end_of_video(fake_nvdec):
+    reader = NVDECVideoReader("video.mp4", stride=1)
+    for _ in range(NUM_FRAMES):
+        assert reader.read()[0]
+
+    assert reader.read() == (False, None)
+    assert not reader.grab()
+
+
+def test_frame_difference_identical_frames():
+    frame = np.random.randint(0, 256, (48, 64, 3), dtype=np.uint8)
+    assert frame_difference(frame, frame.copy()) == 0.0
+
+
+def test_frame_difference_does_not_wrap_uint8():
+    dark = np.zeros((48, 64, 3), dtype=np.uint8)
+    bright = np.full((48, 64, 3), 255, dtype=np.uint8)
+
+    assert frame_difference(dark, bright) == pytest.approx(255.0)
+    assert frame_difference(bright, dark) == pytest.approx(255.0)
+
+
+def test_frame_difference_samples_grid():
+    reference = np.zeros((16, 16, 3), dtype=np.uint8)
+    frame = reference.copy()
+    frame[1::8, :, :] = 200  # Rows the step-8 grid never samples
+
+    assert frame_difference(frame, reference, step=8) == 0.0
+    assert frame_difference(frame, reference, step=1) > 0.0
+
+
+def test_frame_difference_tensors_match_numpy():
+    current = np.random.randint(0, 256, (48, 64, 3), dtype=np.uint8)
+    previous = np.random.randint(0, 256, (48, 64, 3), dtype=np.uint8)
+    to_chw = lambda frame: torch.from_numpy(frame).permute(2, 0, 1).contiguous()
+
+    assert frame_difference(to_chw(current), to_chw(previous)) == pytest.approx(
+        frame_difference(current, previous), rel=1e-5
+    )